@@ -0,0 +1,326 @@
+"""Offline benchmarks for extraction and lookups, run against synthetic fixtures.
+
+    python benchmarks/bench.py --save before.json
+    ... change code ...
+    python benchmarks/bench.py --compare before.json
+
+Comparisons exit with status 1 when any benchmark got worse by more than
+--threshold, so the suite can gate a release.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.stub_server import StubWiki, load_fixtures  # noqa: E402
+from drm_batch import BatchStats, make_record, run_batch  # noqa: E402
+from drm_extract import classify_drm, extract_response, parse_page  # noqa: E402
+from drm_http import WikiClient  # noqa: E402
+from drm_lookup import DRMLookup  # noqa: E402
+from drm_model import ResultTable  # noqa: E402
+from drm_pipeline import ProcessExtractor, default_processes  # noqa: E402
+
+# Each timing runs for at least this long (s) so fast cases aren't dominated by noise
+MIN_TIME = 0.2
+
+# Timings closer than this (ms) never count as a regression, however large the ratio
+NOISE_FLOOR_MS = 0.1
+
+# Pages with more store rows than this are left out of the synthetic catalog
+CATALOG_MAX_STORES = 20
+
+# Cold import budgets (ms, cumulative as reported by -X importtime) for the modules
+# scripts and worker processes start from; going over fails the run like a regression
+IMPORT_BUDGETS_MS = {"drm_checker": 5, "drm_extract": 15, "drm_pipeline": 20, "drm_lookup": 60, "drm_batch": 100}
+# Loaded on first use only; importing any of the modules above must not pull them in
+LAZY_MODULES = ("tkinter", "requests", "multiprocessing")
+IMPORT_ROUNDS = 5
+
+
+def time_per_call(func, repeat):
+    """Best-of-repeat seconds per call, auto-scaling the loop count"""
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= MIN_TIME or loops >= 1 << 20:
+            break
+        loops *= 2
+    best = elapsed / loops
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        best = min(best, (time.perf_counter() - start) / loops)
+    return best
+
+
+class Results:
+    def __init__(self):
+        self.results = {}
+
+    def add(self, name, value, unit, better):
+        self.results[name] = {"value": value, "unit": unit, "better": better}
+        print(f"  {name:<56} {value:>12.3f} {unit}")
+
+
+def bench_extraction(results, pages, repeat):
+    print("Extraction (per page, fixtures in memory)")
+    lookup = DRMLookup(cache=False, http=object())  # extract_* only, never touches the network
+    for title, response in sorted(pages.items()):
+        html = response["parse"]["text"]["*"]
+        name = title.replace(" ", "_")
+        per_page = time_per_call(lambda: classify_drm(parse_page(html)), repeat)
+        results.add(f"extract.single_pass.{name}", per_page * 1000, "ms", "lower")
+        results.add(f"extract.single_pass.{name}.throughput", len(html) / per_page / 1e6, "MB/s", "higher")
+        results.add(f"extract.extract_drm_from_html.{name}",
+                    time_per_call(lambda: lookup.extract_drm_from_html(html), repeat) * 1000, "ms", "lower")
+        results.add(f"extract.extract_availability_table.{name}",
+                    time_per_call(lambda: lookup.extract_availability_table(html), repeat) * 1000, "ms", "lower")
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+
+def bench_lookups(results, stub, pages, rounds):
+    print(f"End-to-end get_drm_info (stub latency {stub.latency * 1000:.0f} ms)")
+    titles = sorted(pages) + ["portl 2", "no such game"]
+    for title in titles:
+        cold = []
+        warm = []
+        for _ in range(rounds):
+            # Fresh lookup: nothing memoized, no persistent cache
+            lookup = DRMLookup(cache=False, http=WikiClient(api_url=stub.url, retries=0))
+            start = time.perf_counter()
+            lookup.get_drm_info(title)
+            cold.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            lookup.get_drm_info(title)
+            warm.append(time.perf_counter() - start)
+            lookup.http.close()
+        name = "_".join(title.split())
+        results.add(f"lookup.cold.p50.{name}", statistics.median(cold) * 1000, "ms", "lower")
+        results.add(f"lookup.cold.p95.{name}", percentile(cold, 95) * 1000, "ms", "lower")
+        results.add(f"lookup.warm.p50.{name}", statistics.median(warm) * 1000, "ms", "lower")
+
+
+class NullWriter:
+    def write(self, record):
+        pass
+
+
+def bench_batch(results, stub, count, concurrency):
+    print(f"Batch mode ({count} distinct pages, {concurrency} workers)")
+    titles = stub.catalog(count)
+    for bulk in (0, 50):
+        lookup = DRMLookup(cache=False, http=WikiClient(api_url=stub.url, retries=0, pool_size=concurrency))
+        requests_before, bytes_before = sum(stub.requests.values()), stub.bytes_sent
+        with open(os.devnull, "w") as devnull:
+            stats = BatchStats(stream=devnull)
+            start = time.perf_counter()
+            run_batch(lookup, titles, NullWriter(), concurrency=concurrency, stats=stats, bulk_size=bulk)
+        elapsed = time.perf_counter() - start
+        mode = "bulk" if bulk else "per_title"
+        results.add(f"batch.{mode}.throughput", count / elapsed, "titles/s", "higher")
+        results.add(f"batch.{mode}.requests", sum(stub.requests.values()) - requests_before, "requests", "lower")
+        results.add(f"batch.{mode}.bytes", (stub.bytes_sent - bytes_before) / 1e3, "kB", "lower")
+        lookup.http.close()
+
+
+def bench_pool(results, pages, count):
+    """Parse-stage throughput on raw response bodies: in-thread vs 1..CPU worker processes"""
+    print(f"Process pool extraction ({count} pages, {default_processes()} CPUs)")
+    bodies = [json.dumps(pages[title]).encode("utf-8") for title in sorted(pages)]
+    bodies = [(bodies[i % len(bodies)], str(i)) for i in range(count)]
+
+    start = time.perf_counter()
+    for raw, title in bodies:
+        extract_response(raw, title)
+    results.add("pool.inline.throughput", count / (time.perf_counter() - start), "pages/s", "higher")
+
+    cpus = default_processes()
+    for processes in sorted({min(2 ** i, cpus) for i in range(cpus.bit_length() + 1)}):
+        with ProcessExtractor(processes) as extractor:
+            # Start the workers before timing; spawning them isn't part of the parse stage
+            list(extractor.pool.map(int, range(processes)))
+            with ThreadPoolExecutor(max_workers=processes * 2) as fetchers:
+                start = time.perf_counter()
+                list(fetchers.map(lambda job: extractor(*job), bodies))
+                elapsed = time.perf_counter() - start
+        results.add(f"pool.processes_{processes}.throughput", count / elapsed, "pages/s", "higher")
+
+
+def bench_catalog(results, pages, count):
+    """Saving and loading a whole catalog of records: JSON lines vs the columnar table"""
+    print(f"Catalog export ({count} records)")
+    lookup = DRMLookup(cache=False, http=object())
+    samples = []
+    for title, response in sorted(pages.items()):
+        page = parse_page(response["parse"]["text"]["*"])
+        if len(page.availability) > CATALOG_MAX_STORES:
+            continue  # Stress-test pages would swamp a typical catalog
+        samples.append({"game": title, "protection": lookup.extract_drm_from_html(page),
+                        "availability": lookup.extract_availability_table(page),
+                        "additional_info": lookup.extract_additional_info(page)})
+    records = [make_record(f"Game {i}", dict(samples[i % len(samples)], game=f"Game {i}"))
+               for i in range(count)]
+    with tempfile.TemporaryDirectory() as tmp:
+        jsonl_path = os.path.join(tmp, "results.jsonl")
+        table_path = os.path.join(tmp, "results.drmc")
+
+        start = time.perf_counter()
+        with open(jsonl_path, "w", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record) + "\n")
+        results.add("catalog.jsonl.save", (time.perf_counter() - start) * 1000, "ms", "lower")
+        start = time.perf_counter()
+        with open(jsonl_path, encoding="utf-8") as f:
+            loaded = [json.loads(line) for line in f]
+        results.add("catalog.jsonl.load", (time.perf_counter() - start) * 1000, "ms", "lower")
+        results.add("catalog.jsonl.size", os.path.getsize(jsonl_path) / 1e6, "MB", "lower")
+
+        start = time.perf_counter()
+        table = ResultTable()
+        table.extend(records)
+        table.save(table_path)
+        results.add("catalog.columnar.save", (time.perf_counter() - start) * 1000, "ms", "lower")
+        start = time.perf_counter()
+        loaded = ResultTable.load(table_path)
+        results.add("catalog.columnar.load", (time.perf_counter() - start) * 1000, "ms", "lower")
+        results.add("catalog.columnar.size", os.path.getsize(table_path) / 1e6, "MB", "lower")
+        if loaded.record(count - 1) != records[-1]:
+            raise AssertionError("columnar round trip changed a record")
+
+
+def import_time(module):
+    """Cumulative import time of module (ms) in a fresh interpreter, and the lazy modules it loaded"""
+    code = f"import sys, {module}; print(*[m for m in {LAZY_MODULES!r} if m in sys.modules])"
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT, capture_output=True,
+                          text=True, check=True)
+    for line in proc.stderr.splitlines():
+        # "import time: self [us] | cumulative | name"; dependencies are indented below the pipe
+        fields = line.split("|")
+        if len(fields) == 3 and fields[2] == " " + module:
+            return int(fields[1]) / 1000, proc.stdout.split()
+    raise RuntimeError(f"no import time reported for {module}")
+
+
+def bench_startup(results):
+    """Import cost of the GUI-free entry points; returns budget violations"""
+    print(f"Startup (cold imports, median of {IMPORT_ROUNDS})")
+    failures = []
+    for module, budget in IMPORT_BUDGETS_MS.items():
+        timings = [import_time(module) for _ in range(IMPORT_ROUNDS)]
+        ms = statistics.median(t for t, _ in timings)
+        results.add(f"startup.import.{module}", ms, "ms", "lower")
+        if ms > budget:
+            failures.append(f"{module} imports in {ms:.1f} ms, over its {budget} ms budget")
+        loaded = timings[0][1]
+        if loaded:
+            failures.append(f"importing {module} loads {', '.join(loaded)}")
+    return failures
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current, baseline_path, threshold):
+    """Print changes against a saved run; return the names that regressed"""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+    print(f"\nCompared with {baseline_path} (regression threshold {threshold:.0%})")
+    regressions = []
+    for name, entry in current.items():
+        old = baseline.get(name)
+        if not old or not old["value"]:
+            continue
+        change = (entry["value"] - old["value"]) / old["value"]
+        worse = change > threshold if entry["better"] == "lower" else change < -threshold
+        if entry["unit"] == "ms" and abs(entry["value"] - old["value"]) < NOISE_FLOOR_MS:
+            worse = False
+        marker = "  REGRESSION" if worse else ""
+        print(f"  {name:<56} {old['value']:>10.3f} -> {entry['value']:>10.3f} {entry['unit']:<9} {change:+7.1%}{marker}")
+        if worse:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark extraction and lookups against synthetic fixtures.")
+    parser.add_argument("--repeat", type=int, default=5, help="timing repeats for extraction (best of)")
+    parser.add_argument("--rounds", type=int, default=10, help="lookups per title for latency percentiles")
+    parser.add_argument("--latency", type=float, default=20.0, help="stub server latency per request (ms)")
+    parser.add_argument("--batch", type=int, default=200, help="titles in the batch benchmark (0 to skip)")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--pool", type=int, default=400, help="pages in the process pool benchmark (0 to skip)")
+    parser.add_argument("--catalog", type=int, default=100000, help="records in the export benchmark (0 to skip)")
+    parser.add_argument("--only", choices=["startup", "extract", "pool", "lookup", "batch", "catalog"], help="run one group only")
+    parser.add_argument("--save", help="write results as JSON for later --compare")
+    parser.add_argument("--compare", help="results JSON from an earlier run")
+    parser.add_argument("--threshold", type=float, default=0.15, help="allowed slowdown before failing")
+    args = parser.parse_args(argv)
+
+    pages, _ = load_fixtures()
+    results = Results()
+    failures = []
+    if args.only in (None, "startup"):
+        failures += bench_startup(results)
+    if args.only in (None, "extract"):
+        bench_extraction(results, pages, args.repeat)
+    if args.only in (None, "pool") and args.pool:
+        bench_pool(results, pages, args.pool)
+    if args.only in (None, "lookup", "batch"):
+        stub = StubWiki(latency=args.latency / 1000)
+        stub.start()
+        try:
+            if args.only in (None, "lookup"):
+                bench_lookups(results, stub, pages, args.rounds)
+            if args.only in (None, "batch") and args.batch:
+                bench_batch(results, stub, args.batch, args.concurrency)
+        finally:
+            stub.stop()
+
+    if args.only in (None, "catalog") and args.catalog:
+        bench_catalog(results, pages, args.catalog)
+
+    if args.save:
+        meta = {
+            "revision": git_revision(),
+            "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "stub_latency_ms": args.latency,
+        }
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({"meta": meta, "results": results.results}, f, indent=1)
+        print(f"\nSaved {len(results.results)} results to {args.save}")
+    for failure in failures:
+        print(f"FAILED: {failure}")
+    if args.compare:
+        regressions = compare(results.results, args.compare, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s)")
+            return 1
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,297 @@
+"""Local stand-in for PCGamingWiki's api.php, serving synthetic fixtures
+(hand-made pages and search results in the shape of the real API's output).
+
+Run standalone to point the app or batch mode at it:
+
+    python benchmarks/stub_server.py --port 8765 --latency 80 --error-rate 0.05
+    python drm_checker.py batch titles.txt --api-url http://127.0.0.1:8765/w/api.php
+"""
+import argparse
+import gzip
+import json
+import os
+import random
+import re
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+API_PATH = "/w/api.php"
+APPID_WHERE_RE = re.compile(r'Steam_AppID HOLDS "(\d+)"')
+CARGO_TITLE_RE = re.compile(r'"((?:[^"\\]|\\.)*)"')
+
+
+def page_key(title):
+    """Canonical page title: spaces, first letter uppercase"""
+    title = " ".join(title.replace("_", " ").split())
+    return title[:1].upper() + title[1:]
+
+
+def search_key(query):
+    return "_".join(query.lower().split())
+
+
+def read_fixture(path):
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def fixture_name(path):
+    """File name without .json/.json.gz, with %XX escapes undone"""
+    name = os.path.basename(path)
+    for suffix in (".gz", ".json"):
+        if name.endswith(suffix):
+            name = name[:-len(suffix)]
+    return urllib.parse.unquote(name)
+
+
+def load_fixtures(fixtures_dir=FIXTURES_DIR):
+    """Return ({page title: parse response}, {search key: search response})"""
+    pages = {}
+    searches = {}
+    for kind, target, key in (("parse", pages, page_key), ("search", searches, search_key)):
+        folder = os.path.join(fixtures_dir, kind)
+        if not os.path.isdir(folder):
+            continue
+        for name in sorted(os.listdir(folder)):
+            if name.endswith((".json", ".json.gz")):
+                target[key(fixture_name(name))] = read_fixture(os.path.join(folder, name))
+    return pages, searches
+
+
+class StubWiki:
+    """Answers the api.php calls the app makes, with optional latency and error injection"""
+
+    def __init__(self, fixtures_dir=FIXTURES_DIR, latency=0.0, jitter=0.0, error_rate=0.0,
+                 error_status=503, retry_after=None, seed=None):
+        self.pages, self.searches = load_fixtures(fixtures_dir)
+        appids_path = os.path.join(fixtures_dir, "cargo", "appids.json")
+        self.appids = read_fixture(appids_path) if os.path.exists(appids_path) else {}
+        # Infobox/Availability rows for cargoquery; pages without one make bulk mode parse them
+        cargo_path = os.path.join(fixtures_dir, "cargo", "pages.json")
+        self.cargo = read_fixture(cargo_path) if os.path.exists(cargo_path) else {}
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+        # Simulated edits for the recent-changes feed; see edit()
+        self.changes = []
+        self.lock = threading.Lock()
+        self.requests = {}
+        self.bytes_sent = 0
+        self._encoded = {}
+        self.server = None
+
+    def answer(self, params):
+        """Return (body dict, fixture key or None) for the query parameters of one request"""
+        action = params.get("action")
+        if action == "parse":
+            key = page_key(params.get("page", ""))
+            if key not in self.pages:
+                return {"error": {"code": "missingtitle", "info": "The page you specified doesn't exist."}}, None
+            return self.pages[key], ("parse", key)
+        if action == "query" and params.get("prop") == "revisions":
+            return self.revisions(params["titles"].split("|")), None
+        if action == "query" and "titles" in params:
+            return self.query_titles(params["titles"].split("|")), None
+        if action == "query" and params.get("list") == "recentchanges":
+            return self.recent_changes(params.get("rcstart")), None
+        if action == "query" and params.get("list") == "search":
+            key = search_key(params.get("srsearch", ""))
+            if key in self.searches:
+                return self.searches[key], ("search", key)
+            return self.search(params.get("srsearch", ""), int(params.get("srlimit", 10))), None
+        if action == "query" and params.get("list") == "allpages":
+            return {"query": {"allpages": [{"ns": 0, "title": t} for t in sorted(self.pages)]}}, None
+        if action == "cargoquery" and "Steam_AppID" in params.get("where", ""):
+            return self.cargo_appids(APPID_WHERE_RE.findall(params["where"])), None
+        if action == "cargoquery":
+            titles = [re.sub(r'\\(.)', r'\1', t) for t in CARGO_TITLE_RE.findall(params.get("where", ""))]
+            return self.cargo_pages(titles), None
+        return {"error": {"code": "badvalue", "info": f"Unsupported request: {params}"}}, None
+
+    def query_titles(self, titles):
+        normalized = []
+        pages = {}
+        for i, title in enumerate(titles):
+            key = page_key(title)
+            if key != title:
+                normalized.append({"from": title, "to": key})
+            if key in self.pages:
+                pages[str(self.pages[key]["parse"].get("pageid", i + 1))] = {"ns": 0, "title": key}
+            else:
+                pages[str(-i - 1)] = {"ns": 0, "title": key, "missing": ""}
+        return {"batchcomplete": "", "query": {"normalized": normalized, "pages": pages}}
+
+    def edit(self, title):
+        """Bump a fixture page to a new revision and list it in the recent-changes feed"""
+        with self.lock:
+            page = self.pages[page_key(title)]["parse"]
+            page["revid"] += 1
+            self._encoded.clear()
+            self.changes.append({"type": "edit", "ns": 0, "title": page["title"], "pageid": page["pageid"],
+                                 "revid": page["revid"], "old_revid": page["revid"] - 1,
+                                 "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())})
+
+    def recent_changes(self, start):
+        # ISO timestamps compare correctly as strings
+        return {"batchcomplete": "", "query": {"recentchanges": [
+            change for change in self.changes if not start or change["timestamp"] >= start]}}
+
+    def revisions(self, titles):
+        body = self.query_titles(titles)
+        for entry in body["query"]["pages"].values():
+            if "missing" not in entry:
+                page = self.pages[entry["title"]]["parse"]
+                entry["revisions"] = [{"revid": page.get("revid", 1), "parentid": page.get("revid", 1) - 1,
+                                       "timestamp": "2024-01-01T00:00:00Z"}]
+        return body
+
+    def cargo_appids(self, appids):
+        """Infobox rows for the pages holding any of appids, as Cargo returns them"""
+        rows = {}
+        for appid in appids:
+            page = self.appids.get(appid)
+            if page:
+                listed = sorted(a for a, p in self.appids.items() if p == page)
+                rows[page] = {"title": {"page": page, "appids": ",".join(listed)}}
+        return {"cargoquery": list(rows.values())}
+
+    def cargo_pages(self, titles):
+        """Joined Infobox_game/Availability rows for the pages in a "_pageName IN (...)" query"""
+        return {"cargoquery": [{"title": dict(self.cargo[title], page=title)}
+                               for title in dict.fromkeys(titles) if title in self.cargo]}
+
+    def catalog(self, count):
+        """Add count numbered copies of the fixture pages ("Portal 2 (copy 7)"...) and return their titles.
+
+        Copies share the fixture's article and Cargo row, so batch benchmarks
+        can run over many distinct pages without more fixture files.
+        """
+        bases = sorted(self.pages)
+        titles = []
+        with self.lock:
+            for i in range(count):
+                base = bases[i % len(bases)]
+                title = f"{base} (copy {i})"
+                parse = dict(self.pages[base]["parse"], title=title, pageid=1000000 + i)
+                self.pages[title] = dict(self.pages[base], parse=parse)
+                if base in self.cargo:
+                    self.cargo[title] = self.cargo[base]
+                titles.append(title)
+        return titles
+
+    def search(self, query, limit):
+        """Made-up search results for queries without a fixture response"""
+        words = query.lower().split()
+        hits = [t for t in sorted(self.pages) if any(w in t.lower() for w in words)][:limit]
+        return {"query": {"search": [{"ns": 0, "title": t} for t in hits]}}
+
+    def encode(self, body, fixture, gzip_ok):
+        """Serialized (and optionally gzipped) body; fixtures are encoded once and reused"""
+        key = (fixture, gzip_ok)
+        data = self._encoded.get(key) if fixture else None
+        if data is None:
+            data = json.dumps(body).encode("utf-8")
+            if gzip_ok:
+                data = gzip.compress(data, compresslevel=5)
+            if fixture:
+                self._encoded[key] = data
+        return data
+
+    def handle(self, params, gzip_ok):
+        delay = self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay:
+            time.sleep(delay)
+        with self.lock:
+            action = params.get("list") or params.get("action", "?")
+            self.requests[action] = self.requests.get(action, 0) + 1
+            fail = self.error_rate and self.random.random() < self.error_rate
+        if fail:
+            headers = {"Retry-After": str(self.retry_after)} if self.retry_after is not None else {}
+            return self.error_status, headers, b""
+        body, fixture = self.answer(params)
+        data = self.encode(body, fixture, gzip_ok)
+        with self.lock:
+            self.bytes_sent += len(data)
+        headers = {"Content-Type": "application/json; charset=utf-8"}
+        if gzip_ok:
+            headers["Content-Encoding"] = "gzip"
+        return 200, headers, data
+
+    def start(self, host="127.0.0.1", port=0):
+        """Serve on a background thread; returns the api.php URL"""
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out as separate writes; without this, delayed
+            # ACKs add ~40 ms to every response and swamp the numbers
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                url = urllib.parse.urlsplit(self.path)
+                if url.path != API_PATH:
+                    self.send_error(404)
+                    return
+                params = dict(urllib.parse.parse_qsl(url.query))
+                gzip_ok = "gzip" in self.headers.get("Accept-Encoding", "")
+                status, headers, data = stub.handle(params, gzip_ok)
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self.url
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}{API_PATH}"
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve synthetic PCGamingWiki fixtures as a local api.php.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fixtures", default=FIXTURES_DIR)
+    parser.add_argument("--latency", type=float, default=0.0, help="added delay per request (ms)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random delay up to this (ms)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests that fail")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--retry-after", type=int, default=None, help="Retry-After seconds on injected errors")
+    args = parser.parse_args(argv)
+
+    stub = StubWiki(args.fixtures, latency=args.latency / 1000, jitter=args.jitter / 1000,
+                    error_rate=args.error_rate, error_status=args.error_status, retry_after=args.retry_after)
+    url = stub.start(args.host, args.port)
+    print(f"Serving {len(stub.pages)} pages at {url} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        stub.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
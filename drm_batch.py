@@ -0,0 +1,244 @@
+import argparse
+import csv
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from drm_bulk import BATCH_SIZE, BulkResolver
+from drm_cache import DEFAULT_TTL
+from drm_http import API_URL, WikiClient
+from drm_lookup import DRMLookup
+from drm_model import ResultTable
+from drm_metrics import Metrics, add_arguments, open_log, profiled, save_snapshot
+from drm_pipeline import ProcessExtractor, default_processes
+
+CSV_FIELDS = ["input", "status", "game", "protection", "stores", "additional_info", "suggestions", "error",
+              "appid"]
+
+# Seconds between progress lines on stderr
+PROGRESS_INTERVAL = 1.0
+
+
+def read_titles(stream):
+    """Yield one title per non-empty line, skipping # comments"""
+    for line in stream:
+        title = line.strip()
+        if title and not title.startswith("#"):
+            yield title
+
+
+def make_record(title, drm_info):
+    if not drm_info:
+        return {"input": title, "status": "not_found"}
+    if "suggestions" in drm_info:
+        return {"input": title, "status": "suggestions", "suggestions": drm_info["suggestions"]}
+    return dict(drm_info, input=title, status="found")
+
+
+def check_title(lookup, title, page=None):
+    """Look up one title (or the page it resolved to) and return a flat record; never raises"""
+    try:
+        # A page already resolved to its canonical title needs only the content fetch
+        drm_info = lookup.try_get_drm_info(page) if page else lookup.get_drm_info(title)
+    except Exception as e:
+        return {"input": title, "status": "error", "error": str(e)}
+    return make_record(title, drm_info)
+
+
+def check_chunk(resolver, titles):
+    """Resolve a chunk through batched queries.
+
+    Returns (records, followups): records for titles answered in bulk, and
+    (title, page) pairs that still need a per-title lookup.
+    """
+    try:
+        results, needs_parse = resolver.resolve_structured(titles)
+    except Exception as e:
+        print(f"Bulk query failed, checking titles one by one: {e}", file=sys.stderr)
+        return [], [(title, None) for title in titles]
+    records = []
+    followups = []
+    for title in titles:
+        if title in needs_parse:
+            followups.append((title, needs_parse[title]))
+        elif results.get(title):
+            records.append(make_record(title, results[title]))
+        else:
+            # Missing page: the full lookup tries other casings and suggestions
+            followups.append((title, None))
+    return records, followups
+
+
+class JsonlWriter:
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, record):
+        self.stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.stream.flush()
+
+
+class CsvWriter:
+    def __init__(self, stream):
+        self.stream = stream
+        self.writer = csv.DictWriter(stream, fieldnames=CSV_FIELDS, extrasaction="ignore")
+        self.writer.writeheader()
+
+    def write(self, record):
+        row = dict(record)
+        row["stores"] = "; ".join(f"{e.get('source', '')}: {e.get('drm', '')}" for e in record.get("availability") or [])
+        row["suggestions"] = "; ".join(record.get("suggestions") or [])
+        self.writer.writerow(row)
+        self.stream.flush()
+
+
+WRITERS = {"jsonl": JsonlWriter, "csv": CsvWriter}
+
+
+class TableWriter:
+    """Collects records into a columnar ResultTable, passing each one on to another writer"""
+
+    def __init__(self, writer=None):
+        self.writer = writer
+        self.table = ResultTable()
+
+    def write(self, record):
+        self.table.append(record)
+        if self.writer is not None:
+            self.writer.write(record)
+
+
+class BatchStats:
+    """Counts and throughput, reported to stderr at most once per interval"""
+
+    def __init__(self, stream=sys.stderr, interval=PROGRESS_INTERVAL):
+        self.stream = stream
+        self.interval = interval
+        self.started = time.monotonic()
+        self.last_report = self.started
+        self.done = 0
+        self.counts = {"found": 0, "suggestions": 0, "not_found": 0, "error": 0}
+
+    def add(self, record):
+        self.done += 1
+        self.counts[record["status"]] += 1
+        now = time.monotonic()
+        if now - self.last_report >= self.interval:
+            self.last_report = now
+            self.report()
+
+    def report(self, final=False):
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        line = (f"{self.done} checked, {self.done / elapsed:.1f} titles/s, "
+                f"{self.counts['found']} found, {self.counts['suggestions']} suggestions, "
+                f"{self.counts['not_found']} not found, {self.counts['error']} errors")
+        if final:
+            line = f"Done in {elapsed:.1f}s: {line}"
+        print(line, file=self.stream, flush=True)
+
+
+def chunks_of(titles, size):
+    chunk = []
+    for title in titles:
+        chunk.append(title)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def run_batch(lookup, titles, writer, concurrency=8, stats=None, bulk_size=0):
+    """Check titles concurrently and hand each record to writer as soon as it finishes.
+
+    Titles are pulled lazily, with at most 2 * concurrency tasks queued, so
+    arbitrarily long inputs (or stdin) stream through in bounded memory.
+    With bulk_size, titles are resolved that many at a time through batched
+    API queries and only the leftovers get individual lookups.
+    """
+    stats = stats or BatchStats()
+    max_pending = concurrency * 2
+    pending = set()
+    resolver = BulkResolver(lookup, batch_size=bulk_size) if bulk_size else None
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="drm-batch") as executor:
+        def drain():
+            nonlocal pending
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                records, followups = future.result()
+                for record in records:
+                    writer.write(record)
+                    stats.add(record)
+                for title, page in followups:
+                    pending.add(executor.submit(check_one, title, page))
+
+        def check_one(title, page=None):
+            return [check_title(lookup, title, page)], []
+
+        tasks = ((check_chunk, resolver, chunk) for chunk in chunks_of(titles, bulk_size)) if resolver \
+            else ((check_one, title) for title in titles)
+        for task in tasks:
+            while len(pending) >= max_pending:
+                drain()
+            pending.add(executor.submit(*task))
+        while pending:
+            drain()
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check DRM for many games without the GUI.")
+    parser.add_argument("input", nargs="?", default="-", help="file with one title per line (default: stdin)")
+    parser.add_argument("-o", "--output", default="-", help="output file (default: stdout)")
+    parser.add_argument("-f", "--format", choices=sorted(WRITERS), default="jsonl")
+    parser.add_argument("-j", "--concurrency", type=int, default=8, help="parallel lookups (default: 8)")
+    parser.add_argument("--offline", action="store_true", help="only use cached results, no network")
+    parser.add_argument("--ttl", type=float, default=DEFAULT_TTL, help="cache max age in seconds")
+    parser.add_argument("--no-cache", action="store_true", help="don't read or write the result cache")
+    parser.add_argument("--bulk", type=int, nargs="?", const=BATCH_SIZE, default=0, metavar="N",
+                        help=f"resolve titles N at a time with batched API queries (default N: {BATCH_SIZE})")
+    parser.add_argument("-p", "--processes", type=int, nargs="?", const=default_processes(), default=0,
+                        metavar="N", help="parse pages in N worker processes while -j threads download "
+                                          f"(default N: {default_processes()}, the CPU count)")
+    parser.add_argument("--api-url", default=API_URL, help="MediaWiki api.php endpoint")
+    parser.add_argument("--export", metavar="FILE",
+                        help="also save all results in the compact columnar format (.drmc or .drmc.gz)")
+    add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    metrics = Metrics(log=open_log(args.metrics_log))
+    http = WikiClient(api_url=args.api_url, pool_size=args.concurrency, metrics=metrics)
+    extractor = ProcessExtractor(args.processes) if args.processes > 0 and not args.offline else None
+    lookup = DRMLookup(cache=not args.no_cache, http=http, offline=args.offline, cache_ttl=args.ttl,
+                       metrics=metrics, extractor=extractor)
+
+    in_stream = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    out_stream = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+    try:
+        writer = WRITERS[args.format](out_stream)
+        if args.export:
+            writer = TableWriter(writer)
+        with profiled(args.profile):
+            stats = run_batch(lookup, read_titles(in_stream), writer,
+                              concurrency=max(1, args.concurrency), bulk_size=max(0, args.bulk))
+        if args.export:
+            writer.table.save(args.export)
+        stats.report(final=True)
+    finally:
+        if in_stream is not sys.stdin:
+            in_stream.close()
+        if out_stream is not sys.stdout:
+            out_stream.close()
+        if extractor:
+            extractor.close()
+        if args.metrics:
+            save_snapshot(lookup.metrics_snapshot(), args.metrics)
+        if metrics.log not in (None, sys.stderr):
+            metrics.log.close()
+    return 1 if stats.counts["error"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
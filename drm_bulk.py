@@ -0,0 +1,155 @@
+import html
+
+from drm_extract import classify_drm_text
+
+# MediaWiki caps multi-title queries and Cargo rows at 50 per request for normal users
+BATCH_SIZE = 50
+
+# PCGamingWiki Cargo tables holding the infobox and availability fields
+CARGO_TABLES = "Infobox_game,Availability"
+CARGO_JOIN = "Infobox_game._pageID=Availability._pageID"
+CARGO_FIELDS = "Infobox_game._pageName=page,Availability.Uses_DRM=drm,Availability.Available_from=stores"
+# Steam_AppID is a list field: one page can cover several AppIDs (editions, soundtracks...)
+APPID_FIELDS = "Infobox_game._pageName=page,Infobox_game.Steam_AppID=appids"
+
+
+def chunked(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def follow_redirects(query, titles):
+    """{title: the page it leads to} per a query response's "normalized" and "redirects" lists"""
+    normalized = {n["from"]: n["to"] for n in query.get("normalized", [])}
+    redirects = {r["from"]: r["to"] for r in query.get("redirects", [])}
+    targets = {}
+    for title in titles:
+        page = normalized.get(title, title)
+        for _ in range(len(redirects)):  # Follow redirect chains without looping forever
+            if page not in redirects:
+                break
+            page = redirects[page]
+        targets[title] = page
+    return targets
+
+
+def split_list(value):
+    """Split a Cargo list field ("Steam,GOG.com") into clean values"""
+    if not value:
+        return []
+    return [html.unescape(v).strip() for v in value.split(",") if v.strip()]
+
+
+def cargo_quote(title):
+    return '"' + title.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+class BulkResolver:
+    """Resolve many titles with batched title and Cargo queries instead of one parse per page.
+
+    Results have the same shape as DRMLookup.try_get_drm_info. Cargo rows
+    only settle the verdict when every store has the same DRM; pages with
+    no DRM field or a mixed list (DRM-free on GOG, Steam on Steam...) fall
+    back to the per-page parse, so the protection matches a lookup.
+
+    Cargo results still lack per-store DRM, notes, OS and the summary. They
+    are never written to the result cache, so the GUI and per-page lookups
+    keep getting the full parse.
+    """
+
+    def __init__(self, lookup, batch_size=BATCH_SIZE):
+        self.lookup = lookup
+        self.http = lookup.http
+        self.cache = lookup.cache
+        self.batch_size = batch_size
+
+    def fetch_structured(self, pages):
+        """Query Cargo for DRM and store fields of pages; pages without a single DRM value map to None"""
+        results = {}
+        for chunk in chunked(pages, self.batch_size):
+            data = self.http.get_json({
+                "action": "cargoquery",
+                "tables": CARGO_TABLES,
+                "join_on": CARGO_JOIN,
+                "fields": CARGO_FIELDS,
+                "where": "Infobox_game._pageName IN (" + ",".join(cargo_quote(p) for p in chunk) + ")",
+                "limit": self.batch_size,
+            })
+            for row in data.get("cargoquery", []):
+                fields = row.get("title", {})
+                page = html.unescape(fields.get("page") or "")
+                drm = split_list(fields.get("drm"))
+                # One label for a mixed list would hide which store is DRM-free; leave those to the parse
+                if page not in chunk or len(set(drm)) != 1 or page in results:
+                    continue
+                results[page] = {
+                    'game': page,
+                    'protection': classify_drm_text(drm[0]),
+                    'availability': [{'source': store, 'drm': '', 'notes': '', 'os': []}
+                                     for store in split_list(fields.get("stores"))],
+                    'additional_info': None
+                }
+        return results
+
+    def resolve_appids(self, appids):
+        """Map Steam AppIDs to the PCGamingWiki pages listing them; unknown AppIDs map to None"""
+        pages = {}
+        for chunk in chunked(list(dict.fromkeys(str(a) for a in appids)), self.batch_size):
+            data = self.http.get_json({
+                "action": "cargoquery",
+                "tables": "Infobox_game",
+                "fields": APPID_FIELDS,
+                "where": " OR ".join(f'Infobox_game.Steam_AppID HOLDS "{appid}"' for appid in chunk),
+                "limit": self.batch_size * 2,
+            })
+            for row in data.get("cargoquery", []):
+                fields = row.get("title", {})
+                page = html.unescape(fields.get("page") or "")
+                for appid in split_list(fields.get("appids")):
+                    if appid in chunk and page:
+                        pages.setdefault(appid, page)
+            for appid in chunk:
+                pages.setdefault(appid, None)
+        return pages
+
+    def resolve_structured(self, titles):
+        """Answer titles from the cache and batched queries only.
+
+        Returns (results, needs_parse): results maps every title to a result
+        or None (page missing); needs_parse maps titles whose page has no
+        structured DRM data to that page title, for the per-page parse.
+        """
+        results = {}
+        needs_parse = {}
+        pending = []
+        offline = self.lookup.offline
+        for title in dict.fromkeys(titles):
+            cached = None
+            if self.cache:
+                cached = self.cache.get(title, max_age=float("inf") if offline else None)
+            if cached or offline:
+                results[title] = cached
+            else:
+                pending.append(title)
+        if not pending:
+            return results, needs_parse
+
+        canonical = self.lookup.resolve_titles(pending, batch_size=self.batch_size)
+        pages = sorted({page for page in canonical.values() if page})
+        structured = self.fetch_structured(pages) if pages else {}
+
+        for title in pending:
+            page = canonical[title]
+            result = structured.get(page) if page else None
+            if page and result is None:
+                needs_parse[title] = page
+            results[title] = result
+        return results, needs_parse
+
+    def resolve(self, titles):
+        """Return {title: result or None} for every title, using as few requests as possible"""
+        results, needs_parse = self.resolve_structured(titles)
+        for title, page in needs_parse.items():
+            # No structured DRM data: fall back to the full article parse
+            results[title] = self.lookup.try_get_drm_info(page)
+        return results
@@ -0,0 +1,213 @@
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+APP_NAME = "SteamDRMChecker"
+
+# Cached results older than this are refetched when online (7 days)
+DEFAULT_TTL = 7 * 24 * 60 * 60
+
+# In-memory memo defaults: short-lived, shared by all lookups in a session
+MEMO_SIZE = 512
+MEMO_TTL = 10 * 60
+
+
+def user_data_dir():
+    """Per-user data directory for the app (created on demand)"""
+    override = os.environ.get("STEAM_DRM_CHECKER_DATA")
+    if override:
+        path = override
+    elif sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.environ.get("APPDATA") or os.path.expanduser("~")
+        path = os.path.join(base, APP_NAME)
+    elif sys.platform == "darwin":
+        path = os.path.join(os.path.expanduser("~/Library/Application Support"), APP_NAME)
+    else:
+        base = os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")
+        path = os.path.join(base, APP_NAME)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def normalize_title(title):
+    """Normalize a page title the way MediaWiki does (spaces, first letter uppercase)"""
+    title = " ".join(title.replace("_", " ").split())
+    if title:
+        title = title[0].upper() + title[1:]
+    return title
+
+
+class ResultCache:
+    """Persistent SQLite cache of extracted DRM results, keyed by page title.
+
+    Each row also records the wiki page it came from and that page's
+    revision ID when known, so a refresh can tell which rows are stale.
+    """
+
+    def __init__(self, path=None, ttl=DEFAULT_TTL):
+        self.path = path or os.path.join(user_data_dir(), "cache.sqlite3")
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " title TEXT PRIMARY KEY,"
+            " data TEXT NOT NULL,"
+            " fetched_at REAL NOT NULL,"
+            " page TEXT,"
+            " revid INTEGER)"
+        )
+        # Caches from before revision tracking lack the last two columns
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(results)")}
+        for column, kind in (("page", "TEXT"), ("revid", "INTEGER")):
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE results ADD COLUMN {column} {kind}")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        self._conn.commit()
+
+    def get(self, title, max_age=None):
+        """Return the cached result for title, or None if missing or older than max_age.
+
+        max_age defaults to the cache TTL; pass float('inf') to ignore age (offline mode).
+        """
+        key = normalize_title(title)
+        if max_age is None:
+            max_age = self.ttl
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data, fetched_at FROM results WHERE title = ?", (key,)
+            ).fetchone()
+            if row is None or time.time() - row[1] > max_age:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, title, result, fetched_at=None, page=None, revid=None):
+        """Store a result dict under title, with the page and revision it was extracted from"""
+        key = normalize_title(title)
+        if fetched_at is None:
+            fetched_at = time.time()
+        data = json.dumps(result, separators=(",", ":"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (title, data, fetched_at, page, revid) VALUES (?, ?, ?, ?, ?)",
+                (key, data, fetched_at, normalize_title(page) if page else None, revid),
+            )
+            self._conn.commit()
+
+    def info(self, title):
+        """(page, revid, fetched_at) stored for title, or None"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT page, revid, fetched_at FROM results WHERE title = ?", (normalize_title(title),)
+            ).fetchone()
+
+    def entries(self):
+        """(title, page, revid, fetched_at) for every row; page falls back to the title"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT title, COALESCE(page, title), revid, fetched_at FROM results"
+            ).fetchall()
+
+    def touch(self, titles, fetched_at=None):
+        """Mark rows as verified up to date without rewriting their data"""
+        if fetched_at is None:
+            fetched_at = time.time()
+        with self._lock:
+            self._conn.executemany("UPDATE results SET fetched_at = ? WHERE title = ?",
+                                   ((fetched_at, normalize_title(title)) for title in titles))
+            self._conn.commit()
+
+    def get_meta(self, key, default=None):
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key, value):
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+            self._conn.commit()
+
+    def delete(self, title):
+        with self._lock:
+            self._conn.execute("DELETE FROM results WHERE title = ?", (normalize_title(title),))
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM results")
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class Memo:
+    """Bounded in-memory LRU with TTL that coalesces concurrent calls for the same key.
+
+    While one caller computes a key, others asking for it wait for that
+    result instead of issuing their own request. Failures are shared with
+    the waiters but never stored.
+    """
+
+    def __init__(self, maxsize=MEMO_SIZE, ttl=MEMO_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.waits = 0  # Callers that shared another caller's in-flight result
+        self._lock = threading.Lock()
+        self._data = OrderedDict()
+        self._inflight = {}
+
+    def get_or_call(self, key, func):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                value, stored_at = entry
+                if time.monotonic() - stored_at <= self.ttl:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                # Imported on the first miss: concurrent.futures brings logging with it
+                from concurrent.futures import Future
+                self.misses += 1
+                future = self._inflight[key] = Future()
+            else:
+                self.waits += 1
+        if not owner:
+            return future.result()
+
+        try:
+            value = func()
+        except BaseException as e:
+            with self._lock:
+                del self._inflight[key]
+            future.set_exception(e)
+            raise
+        with self._lock:
+            del self._inflight[key]
+            self._data[key] = (value, time.monotonic())
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        future.set_result(value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
@@ -0,0 +1,209 @@
+import json
+import re
+import sys
+
+# Page scanner alternatives. Each one only matches text without nested
+# tags, so tokens never hide one another and the article is walked once.
+TOKEN_PATTERNS = {
+    'h1': r'h1[^>]*>(?P<h1>[^<]+)</h1>',
+    'drm': r'(?i:tr[^>]*>\s*<th[^>]*>DRM\s*</th>\s*<td[^>]*>(?P<drm>[^<]+)</td>)',
+    'note': r'(?i:td[^>]*>(?P<note>[^<]*drm[^<]*)</td>)',
+    'summary': r'(?i:p>(?P<summary>[^<]*?)(?:<br|</p>))',
+    'table': r'(?P<table>(?i:table[^>]*class="wikitable"[^>]*>))',
+}
+_token_res = {}
+
+
+def token_re(kinds):
+    """Scanner matching only the still-wanted token kinds (compiled once per combination)"""
+    rx = _token_res.get(kinds)
+    if rx is None:
+        rx = re.compile('<(?:' + '|'.join(TOKEN_PATTERNS[k] for k in TOKEN_PATTERNS if k in kinds) + ')')
+        _token_res[kinds] = rx
+    return rx
+
+
+TABLE_END_RE = re.compile(r'</table>', re.IGNORECASE)
+ROW_RE = re.compile(r'<tr[^>]*>(.*?)</tr>', re.DOTALL)
+CELL_RE = re.compile(r'<td[^>]*>(.*?)</td>', re.DOTALL)
+TAG_RE = re.compile(r'<[^>]*>')
+KEYWORDS = ("drm-free", "steam drm", "denuvo", "no drm")
+
+
+def clean_html(html_text):
+    """Remove HTML tags and clean text"""
+    if '<' in html_text:
+        html_text = TAG_RE.sub('', html_text)
+    return ' '.join(html_text.split())
+
+
+def parse_availability(table_html):
+    """Parse the rows of an availability wikitable body"""
+    availability = []
+    for row in ROW_RE.findall(table_html)[1:]:  # Skip header row
+        cells = CELL_RE.findall(row)
+        if len(cells) >= 3:  # Should have at least Source, DRM, Notes
+            # Extract OS info from last column
+            os_info = []
+            if len(cells) > 5:
+                os_cell = cells[5]
+                if "Windows" in os_cell:
+                    os_info.append("Windows")
+                if "Mac" in os_cell:
+                    os_info.append("Mac")
+                if "Linux" in os_cell:
+                    os_info.append("Linux")
+
+            # Store and DRM names repeat across every game; keep one copy of each
+            availability.append({
+                'source': sys.intern(clean_html(cells[0])),
+                'drm': sys.intern(clean_html(cells[1])),
+                'notes': clean_html(cells[2]),
+                'os': os_info
+            })
+    return availability
+
+
+class ParsedPage:
+    """Everything the extractors need from one article, gathered in one pass"""
+
+    __slots__ = ('html', 'title', 'drm_cell', 'drm_notes', 'summary', 'availability', '_keywords')
+
+    def __init__(self, html):
+        self.html = html
+        self.title = None
+        self.drm_cell = None
+        self.drm_notes = []
+        self.summary = None
+        self.availability = []
+        self._keywords = None
+
+    @property
+    def keywords(self):
+        """DRM keywords present anywhere on the page (lowercase), scanned on first use"""
+        if self._keywords is None:
+            # Each keyword on its own: one regex alternation misses keywords
+            # inside longer ones ("steam drm-free", "no drm-free")
+            lowered = self.html.lower()
+            self._keywords = {keyword for keyword in KEYWORDS if keyword in lowered}
+        return self._keywords
+
+
+def parse_page(html_content):
+    """Walk the article HTML once and collect title, DRM row, notes, summary and availability"""
+    page = ParsedPage(html_content)
+    pending = frozenset(TOKEN_PATTERNS)
+    pos = 0
+    while pending:
+        for match in token_re(pending).finditer(html_content, pos):
+            kind = match.lastgroup
+            if kind == 'note':
+                page.drm_notes.append(match.group('note'))
+                continue
+            if kind == 'h1':
+                page.title = match.group('h1').strip()
+            elif kind == 'drm':
+                page.drm_cell = match.group('drm').strip()
+            elif kind == 'summary':
+                page.summary = match.group('summary').strip()
+            elif kind == 'table':
+                # Only the first availability table counts
+                end = TABLE_END_RE.search(html_content, match.end())
+                if end:
+                    page.availability = parse_availability(html_content[match.end():end.start()])
+            # First match wins for everything but notes; keep scanning without it
+            pending = pending - {kind}
+            pos = match.end()
+            break
+        else:
+            break
+    return page
+
+
+def as_page(html_or_page):
+    if isinstance(html_or_page, ParsedPage):
+        return html_or_page
+    return parse_page(html_or_page)
+
+
+def classify_drm_text(drm_text):
+    """Map an infobox-style DRM value to a protection label"""
+    lowered = drm_text.lower()
+    if "steam" in lowered:
+        return "Steamworks DRM"
+    elif "denuvo" in lowered:
+        return "Denuvo"
+    elif "none" in lowered or "no drm" in lowered or "drm-free" in lowered:
+        return "No protection"
+    else:
+        return drm_text  # Return raw if unknown
+
+
+def classify_drm(page):
+    """Map the parsed page to a protection label"""
+    if page.drm_cell is not None:
+        return classify_drm_text(page.drm_cell)
+
+    for note in page.drm_notes:
+        lowered = note.lower()
+        if "drm-free" in lowered or "no drm" in lowered or "can be run drm-free" in lowered:
+            return "No protection"
+        elif "steam drm" in lowered:
+            return "Steamworks DRM"
+        elif "denuvo" in lowered:
+            return "Denuvo"
+
+    # Listed on Steam: assume Steamworks DRM whatever the DRM column shows
+    if has_steam_entry(page.availability):
+        return "Steamworks DRM"
+
+    # Fallback - look for any DRM-related text in whole page
+    keywords = page.keywords
+    if "drm-free" in keywords:
+        return "No protection"
+    elif "steam drm" in keywords:
+        return "Steamworks DRM"
+    elif "denuvo" in keywords:
+        return "Denuvo"
+    elif "no drm" in keywords:
+        return "No protection"
+
+    return "Not specified"
+
+
+def has_steam_entry(availability):
+    return any(entry.get('source', '').lower() == 'steam' for entry in availability)
+
+
+def build_result(page, fallback_title):
+    """Lookup result dict for a parsed article"""
+    drm_result = classify_drm(page)
+    if not drm_result:
+        # Fallback: Check for Steam logo in availability table
+        if page.availability:
+            # If no specific DRM info but it's on Steam, assume Steamworks DRM
+            if has_steam_entry(page.availability):
+                drm_result = "Steamworks DRM"
+        else:
+            drm_result = "Not specified"
+    return {
+        'game': page.title or fallback_title,
+        'protection': drm_result,
+        'availability': page.availability,
+        'additional_info': page.summary
+    }
+
+
+def extract_response(raw, fallback_title):
+    """Decode and extract a raw action=parse response body.
+
+    Returns (result, page title, revid), or None when the API reports an
+    error (missing page). Module-level and free of shared state so process
+    pools can run it on the bytes exactly as they came off the socket.
+    """
+    data = json.loads(raw)
+    if "error" in data:
+        return None
+    parse = data["parse"]
+    page = parse_page(parse["text"]["*"])
+    return build_result(page, fallback_title), parse.get("title") or fallback_title, parse.get("revid")
@@ -0,0 +1,583 @@
+import tkinter as tk
+from tkinter import ttk, messagebox, font, filedialog
+import sys
+import json
+import time
+import queue
+import argparse
+import threading
+from drm_http import WikiError
+from drm_index import TitleIndex
+from drm_lookup import DRMLookup
+from drm_prefetch import BackgroundExecutor, Prefetcher
+from drm_results_view import ResultsTable, os_text
+from drm_batch import BatchStats, run_batch
+from drm_model import ResultTable
+from drm_metrics import Metrics, add_arguments, open_log, profiled, save_snapshot
+from drm_steam import LibraryScanner, default_steam_root
+
+# How often the Tk loop drains finished lookups (ms)
+RESULT_POLL_MS = 50
+
+# Typing pause before as-you-type suggestions refresh (ms)
+AUTOCOMPLETE_DELAY_MS = 150
+AUTOCOMPLETE_ROWS = 8
+
+AVAILABILITY_COLUMNS = [("Store", 150), ("DRM", 150), ("OS", 130), ("Notes", 300)]
+AVAILABILITY_ROWS = 10
+BATCH_COLUMNS = [("Title", 200), ("Game", 200), ("Protection", 130), ("Stores", 260), ("Status", 90)]
+# How often the batch window pulls finished rows into its table (ms)
+BATCH_REFRESH_MS = 250
+# How often the debug panel refreshes its numbers (ms)
+DEBUG_REFRESH_MS = 1000
+
+class SteamDRMChecker(DRMLookup):
+    def __init__(self, root, prefetch=True, metrics=None):
+        super().__init__(metrics=metrics)
+        self.root = root
+        self.root.title("Steam DRM Checker")
+        self.root.geometry("800x500")
+        self.root.resizable(True, True)
+        self.root.configure(bg="#f5f5f5")
+        
+        # Custom fonts
+        self.title_font = font.Font(family="Segoe UI", size=16, weight="bold")
+        self.label_font = font.Font(family="Segoe UI", size=10)
+        self.result_font = font.Font(family="Consolas", size=9)
+        
+        # Lookups run on worker threads and report back through a queue
+        self.executor = BackgroundExecutor(2, thread_name_prefix="drm-lookup")
+        self.result_queue = queue.Queue()
+        self.search_id = 0
+        self.search_started = None
+        self.pending_lookup = None
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        
+        # F12 shows live stage timings and counters
+        self.debug_panel = None
+        self.root.bind("<F12>", lambda e: self.open_debug_panel())
+        
+        # Optional background lookups of the suggestions currently on screen
+        self.prefetcher = Prefetcher(self) if prefetch else None
+        
+        # Open batch/Steam windows, stopped when the app closes so their checks don't hold up exit
+        self.batch_windows = []
+        
+        # Header
+        header_frame = tk.Frame(root, bg="#2c3e50", pady=10)
+        header_frame.pack(fill=tk.X)
+        
+        title_label = tk.Label(header_frame, text="Steam DRM Checker", 
+                              font=self.title_font, fg="white", bg="#2c3e50")
+        title_label.pack()
+        
+        subtitle_label = tk.Label(header_frame, text="Check if a game uses Steam DRM, Denuvo, or No protection",
+                                 font=("Segoe UI", 9), fg="#ecf0f1", bg="#2c3e50")
+        subtitle_label.pack()
+        
+        # Search frame
+        search_frame = tk.Frame(root, bg="#f5f5f5", pady=15)
+        search_frame.pack(fill=tk.X, padx=20)
+        
+        tk.Label(search_frame, text="Game Name:", font=self.label_font, bg="#f5f5f5").pack(side=tk.LEFT)
+        self.search_var = tk.StringVar()
+        self.search_entry = tk.Entry(search_frame, textvariable=self.search_var, width=50, font=self.label_font)
+        self.search_entry.pack(side=tk.LEFT, padx=10)
+        self.search_entry.bind("<Return>", self.search_game)
+        self.search_entry.bind("<KeyRelease>", self.schedule_autocomplete)
+        self.search_entry.bind("<Down>", self.focus_autocomplete)
+        self.search_entry.bind("<Escape>", lambda e: self.hide_autocomplete())
+        self.autocomplete_job = None
+        
+        self.search_btn = tk.Button(search_frame, text="🔍 Search", command=self.search_game, 
+                                   bg="#3498db", fg="white", font=self.label_font, padx=10)
+        self.search_btn.pack(side=tk.LEFT)
+        
+        self.offline_var = tk.BooleanVar(value=False)
+        self.offline_check = tk.Checkbutton(search_frame, text="Offline", variable=self.offline_var,
+                                            command=self.toggle_offline, font=self.label_font, bg="#f5f5f5")
+        self.offline_check.pack(side=tk.LEFT, padx=10)
+        
+        self.batch_btn = tk.Button(search_frame, text="📋 Batch...", command=self.open_batch,
+                                   font=self.label_font, padx=10)
+        self.batch_btn.pack(side=tk.LEFT)
+        
+        self.steam_btn = tk.Button(search_frame, text="🎮 Steam library", command=self.open_steam_library,
+                                   font=self.label_font, padx=10)
+        self.steam_btn.pack(side=tk.LEFT, padx=5)
+        
+        # Result area
+        result_frame = tk.Frame(root, bg="#ffffff", padx=20, pady=15)
+        result_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
+        
+        tk.Label(result_frame, text="📊 DRM Protection Details:", 
+                font=("Segoe UI", 10, "bold"), bg="#ffffff").pack(anchor="w")
+        
+        # Scrollable result box
+        self.result_canvas = tk.Canvas(result_frame, bg="#ffffff", highlightthickness=0)
+        self.result_canvas.pack(fill=tk.BOTH, expand=True)
+        
+        self.result_scrollbar = tk.Scrollbar(self.result_canvas, orient=tk.VERTICAL, command=self.result_canvas.yview)
+        self.result_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        self.result_inner_frame = tk.Frame(self.result_canvas, bg="#ffffff")
+        self.result_canvas.create_window((0, 0), window=self.result_inner_frame, anchor="nw")
+        self.result_canvas.configure(yscrollcommand=self.result_scrollbar.set)
+        
+        # Bind resize to update canvas scroll region
+        self.result_inner_frame.bind("<Configure>", lambda e: self.result_canvas.configure(scrollregion=self.result_canvas.bbox("all")))
+        
+        # Info footer
+        info_frame = tk.Frame(root, bg="#f5f5f5", pady=5)
+        info_frame.pack(fill=tk.X, side=tk.BOTTOM)
+        
+        info_label = tk.Label(info_frame, text="Data from PCGamingWiki.com • May not be 100% real-time", 
+                             font=("Segoe UI", 8), fg="gray", bg="#f5f5f5")
+        info_label.pack(side=tk.LEFT, expand=True)
+        
+        self.index_label = tk.Label(info_frame, text="⟳ Update title index", font=("Segoe UI", 8),
+                                    fg="#3498db", bg="#f5f5f5", cursor="hand2")
+        self.index_label.pack(side=tk.RIGHT, padx=10)
+        self.index_label.bind("<Button-1>", lambda e: self.update_title_index())
+        self.index_download = None
+        
+        # As-you-type suggestions from the local title index, shown under the entry
+        self.autocomplete_box = tk.Listbox(root, height=AUTOCOMPLETE_ROWS, font=self.label_font,
+                                           activestyle="none", exportselection=False)
+        self.autocomplete_box.bind("<ButtonRelease-1>", self.pick_autocomplete)
+        self.autocomplete_box.bind("<Return>", self.pick_autocomplete)
+        self.autocomplete_box.bind("<Escape>", lambda e: self.hide_autocomplete())
+        
+        # Loading the index takes a moment; do it off the Tk thread
+        threading.Thread(target=self.get_index, daemon=True).start()
+        
+        self.root.after(RESULT_POLL_MS, self.poll_results)
+        
+    def search_game(self, event=None):
+        game_name = self.search_var.get().strip()
+        if not game_name:
+            messagebox.showwarning("Input Error", "Please enter a game name!")
+            return
+        
+        self.hide_autocomplete()
+        
+        # A newer search supersedes the one in flight, and any prefetching
+        if self.prefetcher:
+            self.prefetcher.cancel()
+        self.search_id += 1
+        self.search_started = time.perf_counter()
+        self.metrics.count("searches")
+        if self.pending_lookup is not None:
+            self.pending_lookup.cancel()
+        
+        # Clear previous results
+        self.clear_results()
+            
+        # Show loading
+        loading_label = tk.Label(self.result_inner_frame, text="⏳ Searching... (this may take a few seconds)",
+                                font=self.result_font, bg="#ffffff", fg="gray")
+        loading_label.pack(pady=10)
+        
+        self.pending_lookup = self.executor.submit(self.run_lookup, self.search_id, game_name)
+    
+    def run_lookup(self, search_id, game_name):
+        """Worker thread: do all network work for one search and queue the outcome"""
+        try:
+            drm_info = self.get_drm_info(game_name)
+            self.result_queue.put((search_id, game_name, drm_info, None, None))
+        except Exception as e:
+            self.result_queue.put((search_id, game_name, None, None, e))
+            return
+        
+        # The result is on screen already; similar games follow when the search returns
+        if search_id != self.search_id or not drm_info or "suggestions" in drm_info:
+            return  # Superseded, or nothing to compare against
+        try:
+            similar_games = self.get_similar_games(game_name)
+        except WikiError as e:
+            print(f"Similar games unavailable: {e}", file=sys.stderr)
+            return
+        self.result_queue.put(lambda: self.show_similar_games(similar_games) if search_id == self.search_id else None)
+    
+    def poll_results(self):
+        """Tk loop: render finished lookups, dropping any that were superseded"""
+        try:
+            while True:
+                item = self.result_queue.get_nowait()
+                if callable(item):
+                    item()  # UI update posted by a background thread
+                    continue
+                search_id, game_name, drm_info, similar_games, error = item
+                if search_id != self.search_id:
+                    continue
+                self.pending_lookup = None
+                if error is not None:
+                    self.show_error(error)
+                else:
+                    with self.metrics.stage("display_results"):
+                        self.display_results(drm_info, game_name, similar_games)
+                # What the user actually waited: click to result on screen
+                self.metrics.record("search_to_result", time.perf_counter() - self.search_started,
+                                    title=game_name)
+        except queue.Empty:
+            pass
+        self.root.after(RESULT_POLL_MS, self.poll_results)
+    
+    def schedule_autocomplete(self, event=None):
+        """Debounce keystrokes; suggestions refresh once typing pauses"""
+        if event is not None and event.keysym in ("Return", "Escape", "Down", "Up", "Tab"):
+            return
+        if self.autocomplete_job is not None:
+            self.root.after_cancel(self.autocomplete_job)
+        self.autocomplete_job = self.root.after(AUTOCOMPLETE_DELAY_MS, self.show_autocomplete)
+    
+    def show_autocomplete(self):
+        self.autocomplete_job = None
+        # Never wait for the index here; until it's loaded there are no suggestions
+        index = self.index
+        text = self.search_var.get().strip()
+        matches = index.suggest(text, AUTOCOMPLETE_ROWS) if index and len(text) >= 2 else []
+        if not matches or matches == [text]:
+            self.hide_autocomplete()
+            return
+        self.autocomplete_box.delete(0, tk.END)
+        for title in matches:
+            self.autocomplete_box.insert(tk.END, title)
+        self.autocomplete_box.configure(height=len(matches))
+        entry = self.search_entry
+        self.autocomplete_box.place(x=entry.winfo_rootx() - self.root.winfo_rootx(),
+                                    y=entry.winfo_rooty() - self.root.winfo_rooty() + entry.winfo_height(),
+                                    width=entry.winfo_width())
+        self.autocomplete_box.lift()
+    
+    def hide_autocomplete(self):
+        if self.autocomplete_job is not None:
+            self.root.after_cancel(self.autocomplete_job)
+            self.autocomplete_job = None
+        self.autocomplete_box.place_forget()
+    
+    def focus_autocomplete(self, event=None):
+        if self.autocomplete_box.winfo_ismapped():
+            self.autocomplete_box.focus_set()
+            self.autocomplete_box.selection_set(0)
+            self.autocomplete_box.activate(0)
+    
+    def pick_autocomplete(self, event=None):
+        selection = self.autocomplete_box.curselection()
+        if selection:
+            self.fill_search_box(self.autocomplete_box.get(selection[0]))
+            self.search_entry.focus_set()
+    
+    def update_title_index(self):
+        """Download the full title list in the background and swap in the new index"""
+        if self.index_download is not None and self.index_download.is_alive():
+            return
+        self.index_label.configure(text="⏳ Downloading titles...")
+        
+        def progress(count):
+            self.result_queue.put(lambda: self.index_label.configure(text=f"⏳ {count} titles..."))
+        
+        def work():
+            try:
+                index = TitleIndex.download(self.http, progress=progress)
+                index.save()
+                self.index = index
+                message = f"✓ {len(index)} titles indexed"
+            except Exception as e:
+                message = f"⚠️ Index update failed: {e}"
+            self.result_queue.put(lambda: self.index_label.configure(text=message))
+        
+        self.index_download = threading.Thread(target=work, daemon=True)
+        self.index_download.start()
+    
+    def open_debug_panel(self):
+        if self.debug_panel is not None and self.debug_panel.window.winfo_exists():
+            self.debug_panel.window.lift()
+            return
+        self.debug_panel = DebugPanel(self)
+    
+    def open_batch(self):
+        """Check every title in a text file, streaming rows into a sortable table window"""
+        path = filedialog.askopenfilename(title="Titles to check (one per line)",
+                                          filetypes=[("Text files", "*.txt"), ("All files", "*.*")])
+        if path:
+            BatchWindow(self, f"Batch check - {path}",
+                        lambda window, stats: run_batch(self, window.titles(path), window, stats=stats))
+    
+    def open_steam_library(self):
+        """Check every installed Steam game; only manifests changed since the last scan are re-checked"""
+        steam_root = default_steam_root() or filedialog.askdirectory(title="Steam installation folder")
+        if steam_root:
+            scanner = LibraryScanner(self, steam_root=steam_root)
+            BatchWindow(self, "Steam library",
+                        lambda window, stats: scanner.scan(window, stats=stats, stopped=lambda: window.stopped))
+    
+    def show_error(self, error):
+        self.clear_results()
+        error_label = tk.Label(self.result_inner_frame, text=f"⚠️ Error: {str(error)}\n\nCheck internet connection or try again later.",
+                              font=self.result_font, bg="#ffffff", fg="red", justify=tk.LEFT)
+        error_label.pack(pady=10, padx=10, anchor="w")
+    
+    def on_close(self):
+        for window in self.batch_windows:
+            window.stopped = True
+        self.executor.shutdown()
+        if self.prefetcher:
+            self.prefetcher.shutdown()
+        self.http.close()
+        self.root.destroy()
+    
+    def display_results(self, drm_info, original_name, similar_games=None):
+        self.clear_results()
+        
+        if isinstance(drm_info, dict) and "suggestions" in drm_info:
+            
+            title_label = tk.Label(self.result_inner_frame, text="🔍 Did you mean?", 
+                                  font=("Segoe UI", 12, "bold"), bg="#ffffff", fg="#2c3e50")
+            title_label.pack(anchor="w", pady=(10, 5))
+            
+            for suggestion in drm_info['suggestions']:
+                suggestion_label = tk.Label(self.result_inner_frame, text=f"  • {suggestion}",
+                                           font=self.result_font, bg="#ffffff", fg="#3498db", cursor="hand2")
+                suggestion_label.pack(anchor="w", padx=10, pady=2)
+                suggestion_label.bind("<Button-1>", lambda e, s=suggestion: self.fill_search_box(s))
+            
+            note_label = tk.Label(self.result_inner_frame, text="\n💡 Click any suggestion to search for it!",
+                                 font=("Segoe UI", 9), bg="#ffffff", fg="gray")
+            note_label.pack(anchor="w", padx=10, pady=5)
+            
+            if self.prefetcher:
+                self.prefetcher.prefetch(drm_info['suggestions'])
+            
+        elif drm_info:
+            # Show detailed results
+            game_title = tk.Label(self.result_inner_frame, text=f"🎮 {drm_info['game']}",
+                                 font=("Segoe UI", 14, "bold"), bg="#ffffff", fg="#2c3e50")
+            game_title.pack(anchor="w", pady=(10, 5))
+            
+            # Protection status with color coding
+            protection = drm_info['protection']
+            color = "#27ae60" if protection == "No protection" else "#e74c3c" if protection == "Denuvo" else "#3498db"
+            
+            protection_label = tk.Label(self.result_inner_frame, text=f"🛡️ Protection: {protection}",
+                                       font=("Segoe UI", 11, "bold"), bg="#ffffff", fg=color)
+            protection_label.pack(anchor="w", pady=5)
+            
+            # Show availability table if available
+            if 'availability' in drm_info and drm_info['availability']:
+                tk.Label(self.result_inner_frame, text="\n📦 Availability:", 
+                        font=("Segoe UI", 10, "bold"), bg="#ffffff", fg="#2c3e50").pack(anchor="w", pady=(10, 5))
+                
+                # One Treeview instead of a frame of labels per store
+                rows = [(entry.get('source', 'Unknown'), entry.get('drm', 'N/A'),
+                         os_text(entry.get('os', [])), entry.get('notes', ''))
+                        for entry in drm_info['availability']]
+                table = ResultsTable(self.result_inner_frame, AVAILABILITY_COLUMNS,
+                                     height=min(len(rows), AVAILABILITY_ROWS))
+                table.pack(anchor="w", fill=tk.X, padx=10, pady=3)
+                table.set_rows(rows)
+            
+            # Add more info if available
+            if 'additional_info' in drm_info:
+                tk.Label(self.result_inner_frame, text="\nℹ️ Additional Info:", 
+                        font=("Segoe UI", 10, "bold"), bg="#ffffff", fg="#2c3e50").pack(anchor="w", pady=(10, 5))
+                
+                info_label = tk.Label(self.result_inner_frame, text=drm_info['additional_info'],
+                                     font=self.result_font, bg="#ffffff", fg="gray", wraplength=600, justify=tk.LEFT)
+                info_label.pack(anchor="w", padx=10, pady=5)
+            
+            # Show similar games (excluding exact match) once the worker has them
+            if similar_games:
+                self.show_similar_games(similar_games)
+                
+        else:
+            # Game not found
+            not_found_label = tk.Label(self.result_inner_frame, text=f"❌ Game '{original_name}' not found.",
+                                      font=("Segoe UI", 12, "bold"), bg="#ffffff", fg="#e74c3c")
+            not_found_label.pack(anchor="w", pady=10)
+            
+            note_label = tk.Label(self.result_inner_frame, text="Try:\n• Using exact title\n• Checking spelling\n• Using first letter uppercase\n• Searching PCGamingWiki directly",
+                                 font=self.result_font, bg="#ffffff", fg="gray", justify=tk.LEFT)
+            note_label.pack(anchor="w", padx=10, pady=5)
+    
+    def show_similar_games(self, similar_games):
+        if not similar_games:
+            return
+        tk.Label(self.result_inner_frame, text="\n🔍 Similar Games:", 
+                font=("Segoe UI", 10, "bold"), bg="#ffffff", fg="#2c3e50").pack(anchor="w", pady=(15, 5))
+        
+        for suggestion in similar_games[:5]:  # Show top 5
+            suggestion_label = tk.Label(self.result_inner_frame, text=f"  • {suggestion}",
+                                       font=self.result_font, bg="#ffffff", fg="#3498db", cursor="hand2")
+            suggestion_label.pack(anchor="w", padx=10, pady=2)
+            suggestion_label.bind("<Button-1>", lambda e, s=suggestion: self.fill_search_box(s))
+        
+        note_label = tk.Label(self.result_inner_frame, text="💡 Click any suggestion to search for it!",
+                             font=("Segoe UI", 9), bg="#ffffff", fg="gray")
+        note_label.pack(anchor="w", padx=10, pady=5)
+        
+        if self.prefetcher:
+            self.prefetcher.prefetch(similar_games[:5])
+    
+    def clear_results(self):
+        for widget in self.result_inner_frame.winfo_children():
+            widget.destroy()
+    
+    def toggle_offline(self):
+        self.offline = self.offline_var.get()
+    
+    def fill_search_box(self, suggestion):
+        self.search_var.set(suggestion)
+        self.search_game()
+    
+class BatchWindow:
+    """Toplevel running a batch check in the background and listing results as they arrive"""
+    
+    def __init__(self, app, title, job):
+        self.app = app
+        self.title = title
+        self.job = job  # job(window, stats) writes records to the window until done
+        self.stopped = False
+        self.records = queue.Queue()
+        
+        self.window = tk.Toplevel(app.root)
+        self.window.title(title)
+        self.window.geometry("900x550")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+        app.batch_windows.append(self)
+        
+        # Full records for export, kept column-wise; the Treeview only has the displayed fields
+        self.results = ResultTable()
+        
+        top = tk.Frame(self.window)
+        top.pack(fill=tk.X, padx=10, pady=(10, 0))
+        self.status_label = tk.Label(top, text="⏳ Checking...", font=app.label_font, anchor="w")
+        self.status_label.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        tk.Button(top, text="💾 Export...", command=self.export, font=app.label_font).pack(side=tk.RIGHT)
+        self.table = ResultsTable(self.window, BATCH_COLUMNS, protection_column="Protection",
+                                  height=20, filterable=True, bg="#f5f5f5")
+        self.table.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        self.done = False
+        threading.Thread(target=self.run, daemon=True).start()
+        self.window.after(BATCH_REFRESH_MS, self.refresh)
+    
+    def titles(self, path):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if self.stopped:
+                    return
+                title = line.strip()
+                if title and not title.startswith("#"):
+                    yield title
+    
+    def write(self, record):
+        self.records.put(record)
+    
+    def run(self):
+        try:
+            self.job(self, BatchStats(interval=float("inf")))
+        except Exception as e:
+            self.records.put({"input": self.title, "status": "error", "error": str(e)})
+        self.done = True
+    
+    def refresh(self):
+        if self.stopped:
+            return
+        rows = []
+        try:
+            while True:
+                record = self.records.get_nowait()
+                self.results.append(record)
+                stores = ", ".join(e.get('source', '') for e in record.get('availability') or [])
+                rows.append((record["input"], record.get("game", ""), record.get("protection", ""),
+                             stores or record.get("error", ""), record["status"]))
+        except queue.Empty:
+            pass
+        if rows:
+            self.table.add_rows(rows)
+        if self.done and self.records.empty():
+            self.status_label.configure(text=f"✓ {len(self.table.rows)} titles checked")
+        else:
+            self.status_label.configure(text=f"⏳ {len(self.table.rows)} titles checked...")
+            self.window.after(BATCH_REFRESH_MS, self.refresh)
+    
+    def export(self):
+        path = filedialog.asksaveasfilename(parent=self.window, title="Export results",
+                                            defaultextension=".drmc",
+                                            filetypes=[("Compact results", "*.drmc"), ("JSON lines", "*.jsonl")])
+        if not path:
+            return
+        if path.endswith(".jsonl"):
+            with open(path, "w", encoding="utf-8") as f:
+                for record in self.results:
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        else:
+            self.results.save(path)
+    
+    def close(self):
+        self.stopped = True
+        self.app.batch_windows.remove(self)
+        self.window.destroy()
+
+class DebugPanel:
+    """Toplevel with the session's stage timings and counters, refreshed while open"""
+    
+    def __init__(self, app):
+        self.app = app
+        self.window = tk.Toplevel(app.root)
+        self.window.title("Debug - timings")
+        self.window.geometry("420x500")
+        
+        buttons = tk.Frame(self.window)
+        buttons.pack(fill=tk.X, padx=10, pady=(10, 0))
+        tk.Button(buttons, text="Reset", command=app.metrics.reset).pack(side=tk.LEFT)
+        tk.Button(buttons, text="Save JSON...", command=self.save).pack(side=tk.LEFT, padx=5)
+        
+        self.text = tk.Text(self.window, font=app.result_font, wrap=tk.NONE)
+        self.text.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self.refresh()
+    
+    def refresh(self):
+        if not self.window.winfo_exists():
+            return
+        snapshot = self.app.metrics_snapshot()
+        lines = [f"{'stage':<22}{'count':>7}{'mean ms':>10}{'max ms':>10}"]
+        for name, stage in snapshot["stages"].items():
+            lines.append(f"{name:<22}{stage['count']:>7}{stage['mean_ms']:>10.1f}{stage['max_ms']:>10.1f}")
+        lines.append("")
+        for section in ("counters", "http", "cache", "memo"):
+            for name, value in snapshot.get(section, {}).items():
+                lines.append(f"{section}.{name}: {value}")
+        self.text.delete("1.0", tk.END)
+        self.text.insert(tk.END, "\n".join(lines))
+        self.window.after(DEBUG_REFRESH_MS, self.refresh)
+    
+    def save(self):
+        path = filedialog.asksaveasfilename(parent=self.window, defaultextension=".json",
+                                            filetypes=[("JSON", "*.json")])
+        if path:
+            save_snapshot(self.app.metrics_snapshot(), path)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="drm_checker.py",
+                                     description="Check which DRM a game uses, from PCGamingWiki.",
+                                     epilog="Headless commands: batch, steam, refresh "
+                                            "(e.g. 'drm_checker.py batch --help').")
+    add_arguments(parser)
+    parser.add_argument("--debug", action="store_true", help="open the timings panel (F12) at start")
+    args = parser.parse_args(argv)
+    
+    metrics = Metrics(log=open_log(args.metrics_log))
+    with profiled(args.profile):
+        root = tk.Tk()
+        app = SteamDRMChecker(root, metrics=metrics)
+        if args.debug:
+            app.open_debug_panel()
+        root.mainloop()
+    if args.metrics:
+        save_snapshot(app.metrics_snapshot(), args.metrics)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,152 @@
+import random
+import threading
+import time
+
+API_URL = "https://www.pcgamingwiki.com/w/api.php"
+USER_AGENT = "SteamDRMChecker/1.0 (+https://github.com/As9xm/SteamDRMChecker)"
+
+# Statuses worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class WikiError(Exception):
+    """The wiki could not be reached or kept failing; not the same as 'page not found'"""
+
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+
+def parse_retry_after(value):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date), or None"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    from email.utils import parsedate_to_datetime  # rarely needed and slow to import
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def new_session(user_agent, pool_size):
+    # requests pulls in urllib3, idna, certifi... and is most of the startup time,
+    # so it is only imported once something actually goes over the network
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    session.headers.update({
+        "User-Agent": user_agent,
+        "Accept-Encoding": "gzip, deflate",
+        "Connection": "keep-alive",
+    })
+    adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class WikiClient:
+    """Shared HTTP client for the PCGamingWiki API: pooled keep-alive session, retries with backoff"""
+
+    def __init__(self, api_url=API_URL, timeout=10, retries=3, backoff=0.5, max_backoff=30.0,
+                 pool_size=10, user_agent=USER_AGENT, metrics=None):
+        self.api_url = api_url
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.metrics = metrics
+        self.user_agent = user_agent
+        self.pool_size = pool_size
+
+        self._session = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.retry_count = 0
+        self.bytes_received = 0
+
+    @property
+    def session(self):
+        """The keep-alive session, created on the first request"""
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = new_session(self.user_agent, self.pool_size)
+        return self._session
+
+    def thread_bytes(self):
+        """Response body bytes received so far by the calling thread"""
+        return getattr(self._local, "bytes", 0)
+
+    def backoff_delay(self, attempt, retry_after=None):
+        """Exponential backoff with jitter; Retry-After wins when the server sends one"""
+        if retry_after is not None:
+            return min(retry_after, self.max_backoff)
+        delay = self.backoff * (2 ** attempt)
+        return min(delay + random.uniform(0, delay / 2), self.max_backoff)
+
+    def get(self, params):
+        """GET the API with params, retrying 429/5xx and connection errors. Raises WikiError."""
+        session = self.session
+        import requests  # already loaded by the session; only needed for its exception types
+        # Worth another attempt; other RequestExceptions (bad URL, redirect loop...) won't get better
+        transient = (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError,
+                     requests.exceptions.ContentDecodingError)
+
+        params = dict(params, format="json")
+        last_error = None
+        for attempt in range(self.retries + 1):
+            retry_after = None
+            start = time.perf_counter()
+            try:
+                response = session.get(self.api_url, params=params, timeout=self.timeout)
+            except requests.RequestException as e:
+                last_error = WikiError(f"Request failed: {e}")
+                if self.metrics:
+                    self.metrics.record("http", time.perf_counter() - start, action=params.get("action"),
+                                        attempt=attempt, error=type(e).__name__)
+                if not isinstance(e, transient):
+                    raise last_error from e
+            else:
+                size = len(response.content)
+                if self.metrics:
+                    # elapsed stops at the response headers (connect + server time); the rest is the body
+                    self.metrics.record("http", time.perf_counter() - start, action=params.get("action"),
+                                        attempt=attempt, status=response.status_code, bytes=size,
+                                        wait_ms=round(response.elapsed.total_seconds() * 1000, 3))
+                self._local.bytes = self.thread_bytes() + size
+                with self._lock:
+                    self.bytes_received += size
+                if response.status_code == 200:
+                    return response
+                last_error = WikiError(f"HTTP {response.status_code} from {self.api_url}",
+                                       status=response.status_code)
+                if response.status_code not in RETRY_STATUSES:
+                    raise last_error
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if attempt < self.retries:
+                with self._lock:
+                    self.retry_count += 1
+                time.sleep(self.backoff_delay(attempt, retry_after))
+        raise last_error
+
+    def get_json(self, params):
+        """GET the API and decode its JSON body"""
+        response = self.get(params)
+        start = time.perf_counter()
+        try:
+            data = response.json()
+        except ValueError as e:
+            raise WikiError(f"Invalid JSON from {self.api_url}: {e}", status=response.status_code)
+        if self.metrics:
+            self.metrics.record("json_decode", time.perf_counter() - start)
+        return data
+
+    def close(self):
+        if self._session is not None:
+            self._session.close()
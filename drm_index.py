@@ -0,0 +1,180 @@
+import argparse
+import bisect
+import gzip
+import os
+import sys
+import time
+from array import array
+from collections import Counter
+from difflib import SequenceMatcher
+
+from drm_cache import user_data_dir
+
+INDEX_FILE = "titles.txt.gz"
+
+# Candidates kept from the n-gram count before the finer edit-distance ranking
+RERANK_CANDIDATES = 50
+
+
+def fold(text):
+    """Lowercase and reduce punctuation to single spaces for matching"""
+    return " ".join("".join(ch if ch.isalnum() else " " for ch in text.lower()).split())
+
+
+def trigrams(folded):
+    padded = f"  {folded} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def default_index_path():
+    return os.path.join(user_data_dir(), INDEX_FILE)
+
+
+class TitleIndex:
+    """Compact local index of wiki page titles for offline fuzzy search and prefix completion"""
+
+    def __init__(self, titles, built_at=None):
+        self.titles = sorted(set(t for t in titles if t))
+        self.built_at = built_at
+        self.folded = [fold(t) for t in self.titles]
+
+        # Prefix completion: folded titles in sorted order, pointing back at titles
+        self._prefix_order = sorted(range(len(self.titles)), key=self.folded.__getitem__)
+        self._prefix_keys = [self.folded[i] for i in self._prefix_order]
+
+        # Trigram postings, packed into arrays once built
+        postings = {}
+        self._gram_counts = array("H")
+        for i, folded in enumerate(self.folded):
+            grams = trigrams(folded)
+            self._gram_counts.append(min(len(grams), 0xFFFF))
+            for gram in grams:
+                postings.setdefault(gram, []).append(i)
+        self._postings = {gram: array("I", ids) for gram, ids in postings.items()}
+
+    def __len__(self):
+        return len(self.titles)
+
+    def complete(self, prefix, limit=10):
+        """Titles starting with prefix (case and punctuation insensitive)"""
+        key = fold(prefix)
+        if not key:
+            return []
+        start = bisect.bisect_left(self._prefix_keys, key)
+        matches = []
+        for pos in range(start, min(start + limit, len(self._prefix_keys))):
+            if not self._prefix_keys[pos].startswith(key):
+                break
+            matches.append(self.titles[self._prefix_order[pos]])
+        return matches
+
+    def search(self, query, limit=10):
+        """Closest titles to query by trigram overlap, reranked by edit similarity"""
+        key = fold(query)
+        if not key:
+            return []
+        grams = trigrams(key)
+        postings = sorted((self._postings[g] for g in grams if g in self._postings), key=len)
+        if not postings:
+            return []
+        # Very common grams (" 2 ", "the") add cost but little signal; skip them
+        # when rarer grams of the query already select candidates
+        common = max(len(self.titles) // 20, 1000)
+        counts = Counter()
+        for n, ids in enumerate(postings):
+            if n >= 2 and len(ids) > common:
+                break
+            counts.update(ids)
+
+        # Dice coefficient on trigram sets picks a short list cheaply
+        scored = sorted(counts.items(),
+                        key=lambda item: 2 * item[1] / (len(grams) + self._gram_counts[item[0]]),
+                        reverse=True)[:RERANK_CANDIDATES]
+        # Rerank by how much of the query each title covers plus edit similarity
+        matcher = SequenceMatcher(autojunk=False)
+        matcher.set_seq2(key)
+        ranked = []
+        for i, shared in scored:
+            folded = self.folded[i]
+            matcher.set_seq1(folded)
+            coverage = len(grams & trigrams(folded)) / len(grams)
+            bonus = 0.1 if folded.startswith(key) else 0.0
+            ranked.append((0.6 * coverage + 0.4 * matcher.ratio() + bonus, i))
+        ranked.sort(reverse=True)
+        return [self.titles[i] for _, i in ranked[:limit]]
+
+    def suggest(self, query, limit=10):
+        """Prefix matches first, then fuzzy matches, without duplicates"""
+        results = list(dict.fromkeys(self.complete(query, limit) + self.search(query, limit)))
+        return results[:limit]
+
+    def save(self, path=None):
+        path = path or default_index_path()
+        tmp_path = path + ".tmp"
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            f.write(f"# built {self.built_at or time.time()}\n")
+            for title in self.titles:
+                f.write(title + "\n")
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=None):
+        """Load a saved index, or return None if there isn't one"""
+        path = path or default_index_path()
+        if not os.path.exists(path):
+            return None
+        built_at = None
+        titles = []
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                line = line.rstrip("\n")
+                if line.startswith("# built "):
+                    built_at = float(line[8:])
+                elif line:
+                    titles.append(line)
+        return cls(titles, built_at=built_at)
+
+    @classmethod
+    def download(cls, http, progress=None):
+        """Build an index from every article title on the wiki (list=allpages, 500 per request)"""
+        titles = []
+        params = {"action": "query", "list": "allpages", "apnamespace": 0,
+                  "apfilterredir": "nonredirects", "aplimit": "max"}
+        while True:
+            data = http.get_json(params)
+            titles.extend(page["title"] for page in data.get("query", {}).get("allpages", []))
+            if progress:
+                progress(len(titles))
+            cont = data.get("continue")
+            if not cont:
+                break
+            params = dict(params, **cont)
+        return cls(titles, built_at=time.time())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Download or query the local PCGamingWiki title index.")
+    parser.add_argument("query", nargs="?", help="look up a title in the local index")
+    parser.add_argument("--update", action="store_true", help="download a fresh title list")
+    parser.add_argument("--path", default=None, help=f"index file (default: {INDEX_FILE} in the data dir)")
+    args = parser.parse_args(argv)
+
+    if args.update:
+        from drm_http import WikiClient
+        index = TitleIndex.download(WikiClient(),
+                                    progress=lambda n: print(f"{n} titles...", file=sys.stderr, flush=True))
+        index.save(args.path)
+        print(f"Saved {len(index)} titles", file=sys.stderr)
+    else:
+        index = TitleIndex.load(args.path)
+        if index is None:
+            print("No title index yet; run with --update first", file=sys.stderr)
+            return 1
+    if args.query:
+        for title in index.suggest(args.query):
+            print(title)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,278 @@
+import sys
+import threading
+
+from drm_cache import ResultCache, Memo, DEFAULT_TTL, normalize_title
+from drm_bulk import BATCH_SIZE, chunked, follow_redirects
+from drm_http import WikiClient, WikiError
+from drm_extract import parse_page, as_page, build_result, classify_drm, clean_html
+from drm_metrics import Metrics
+from drm_pipeline import ExtractorError
+
+
+def title_variants(game_name):
+    """Spellings worth probing for a typed name: as typed, words capitalized, title case"""
+    game_name = " ".join(game_name.split())
+    capitalized = " ".join(word[:1].upper() + word[1:] for word in game_name.split(" "))
+    return list(dict.fromkeys(v for v in (game_name, capitalized, game_name.title()) if v))
+
+
+class DRMLookup:
+    """PCGamingWiki lookup and extraction core, usable without any UI"""
+
+    def __init__(self, cache=True, http=None, offline=False, cache_ttl=DEFAULT_TTL, memo=None,
+                 index=None, metrics=None, extractor=None):
+        # Stage timings and counters for this session
+        self.metrics = metrics or Metrics()
+        
+        # Persistent result cache (SQLite in the user data dir)
+        self.cache_ttl = cache_ttl
+        if cache is True:
+            try:
+                cache = ResultCache(ttl=cache_ttl)
+            except Exception as e:
+                print(f"Result cache unavailable: {e}", file=sys.stderr)
+                cache = None
+        self.cache = cache or None
+        self.offline = offline
+        
+        # Shared keep-alive session for every wiki request
+        self.http = http or WikiClient(metrics=self.metrics)
+        
+        # Short-lived memo of page and search responses, with in-flight coalescing
+        self.memo = memo or Memo()
+        
+        # Local title index for offline suggestions, loaded on first use
+        self.index = index
+        self._index_lock = threading.Lock()
+        self._index_loaded = index is not None
+        
+        # Optional callable(raw body, title) -> drm_extract.extract_response's tuple,
+        # e.g. drm_pipeline.ProcessExtractor to parse on other cores
+        self.extractor = extractor
+    
+    def get_index(self):
+        """The local title index, loading it from disk once; None if there isn't one"""
+        with self._index_lock:
+            if not self._index_loaded:
+                self._index_loaded = True
+                from drm_index import TitleIndex  # difflib and friends; only the suggestion path needs them
+                try:
+                    self.index = TitleIndex.load()
+                except Exception as e:
+                    print(f"Title index unavailable: {e}", file=sys.stderr)
+            return self.index
+    
+    def metrics_snapshot(self):
+        """Stage timings plus network, cache and memo counters as one JSON-ready dict"""
+        extra = {
+            "http": {"bytes_received": self.http.bytes_received, "retries": self.http.retry_count},
+            "memo": {"hits": self.memo.hits, "misses": self.memo.misses, "waits": self.memo.waits},
+        }
+        if self.cache:
+            extra["cache"] = {"hits": self.cache.hits, "misses": self.cache.misses}
+        return self.metrics.snapshot(**extra)
+    
+    def get_drm_info(self, game_name):
+        with self.metrics.stage("lookup", title=game_name) as stage:
+            result = self._get_drm_info(game_name)
+            stage["outcome"] = ("not_found" if not result else
+                                "suggestions" if "suggestions" in result else "found")
+        return result
+    
+    def _get_drm_info(self, game_name):
+        variants = title_variants(game_name)
+        
+        # Step 1: Any spelling we already have a cached answer for
+        if self.cache:
+            max_age = float("inf") if self.offline else None
+            for variant in variants:
+                cached = self.cache.get(variant, max_age=max_age)
+                if cached:
+                    return cached
+        
+        # Step 2: One query resolves casing and redirects for all variants,
+        # so only the winning page is downloaded
+        if not self.offline:
+            page = self.resolve_title(variants)
+            if page:
+                result = self.try_get_drm_info(page)
+                if result:
+                    if self.cache and normalize_title(page) != normalize_title(game_name):
+                        # Alias row: refreshed whenever the page it points at changes
+                        info = self.cache.info(page)
+                        self.cache.put(game_name, result, page=page, revid=info[1] if info else None)
+                    return result
+        
+        # Step 3: Nothing matched, offer search results instead
+        suggestions = self.search_suggestions(game_name)
+        if suggestions:
+            return {"suggestions": suggestions}
+        
+        return None
+    
+    def resolve_titles(self, titles, batch_size=BATCH_SIZE):
+        """Map each title to its canonical page title (following redirects), or None if missing"""
+        canonical = {}
+        for chunk in chunked(titles, batch_size):
+            data = self.http.get_json({"action": "query", "titles": "|".join(chunk), "redirects": 1})
+            query = data.get("query", {})
+            existing = {p["title"] for p in query.get("pages", {}).values()
+                        if "missing" not in p and "invalid" not in p}
+            for title, page in follow_redirects(query, chunk).items():
+                canonical[title] = page if page in existing else None
+        return canonical
+    
+    def resolve_title(self, variants):
+        """First spelling in variants that names an existing page, as its canonical title"""
+        variants = [v for v in variants if "|" not in v]
+        if not variants:
+            return None
+        return self.memo.get_or_call(("resolve",) + tuple(variants), lambda: self._first_existing(variants))
+    
+    def _first_existing(self, variants):
+        with self.metrics.stage("resolve"):
+            canonical = self.resolve_titles(variants)
+        for variant in variants:
+            if canonical[variant]:
+                return canonical[variant]
+        return None
+    
+    def try_get_drm_info(self, game_name, refresh=False):
+        """Try to get DRM info for a specific game name"""
+        if refresh and not self.offline:
+            # Known to be stale: skip the cache and memo, download the current revision
+            return self.fetch_drm_info(game_name)
+        
+        # Serve from cache; offline mode accepts entries of any age
+        if self.cache:
+            cached = self.cache.get(game_name, max_age=float("inf") if self.offline else None)
+            if cached:
+                return cached
+        if self.offline:
+            return None
+        
+        # Concurrent and repeated requests for one page share a single fetch
+        return self.memo.get_or_call(("page", normalize_title(game_name)),
+                                     lambda: self.fetch_drm_info(game_name))
+    
+    def fetch_drm_info(self, game_name):
+        """Download and extract one article, storing the result in the cache"""
+        wiki_page = game_name.replace(" ", "_")
+        
+        try:
+            # Network failures raise WikiError instead of looking like a missing page
+            # redirects=1 so a stored title that became a redirect still yields the article
+            params = {"action": "parse", "page": wiki_page, "redirects": 1}
+            if self.extractor:
+                # Decoding and parsing happen in the extractor; only the raw body goes over
+                response = self.http.get(params)
+                with self.metrics.stage("extract_pool", bytes=len(response.content)):
+                    extracted = self.extractor(response.content, game_name)
+                if extracted is None:
+                    return None
+                result, page_title, revid = extracted
+            else:
+                data = self.http.get_json(params)
+                if "error" in data:
+                    return None
+                
+                html_content = data["parse"]["text"]["*"]
+                
+                # One pass over the article feeds every extractor below
+                with self.metrics.stage("parse_page", chars=len(html_content)):
+                    page = parse_page(html_content)
+                with self.metrics.stage("extract"):
+                    result = build_result(page, game_name)
+                page_title, revid = data["parse"].get("title") or game_name, data["parse"].get("revid")
+            
+            if self.cache:
+                self.cache.put(game_name, result, page=page_title, revid=revid)
+            return result
+                
+        except (WikiError, ExtractorError):
+            # Network or worker pool failures: reported as errors, not as a missing page
+            raise
+        except Exception as e:
+            print(f"Error fetching {game_name}: {e}", file=sys.stderr)
+            return None
+    
+    def extract_drm_from_html(self, html_content):
+        """Classify protection from article HTML (or an already parsed page)"""
+        with self.metrics.stage("extract_drm"):
+            return classify_drm(as_page(html_content))
+    
+    def extract_availability_table(self, html_content):
+        """Extract availability table data"""
+        with self.metrics.stage("extract_availability"):
+            return as_page(html_content).availability
+    
+    def extract_additional_info(self, html_content):
+        """Extract general info about the game"""
+        with self.metrics.stage("extract_info"):
+            return as_page(html_content).summary
+    
+    def clean_html(self, html_text):
+        """Remove HTML tags and clean text"""
+        return clean_html(html_text)
+    
+    def search_suggestions(self, game_name):
+        """Search PCGamingWiki for similar game names"""
+        with self.metrics.stage("search", offline=self.offline):
+            return self._search_suggestions(game_name)
+    
+    def _search_suggestions(self, game_name):
+        if self.offline:
+            # The local title index stands in for the live search
+            index = self.get_index()
+            return index.search(game_name) if index else []
+        
+        key = ("search", " ".join(game_name.lower().split()))
+        return list(self.memo.get_or_call(key, lambda: self.fetch_suggestions(game_name)))
+    
+    def fetch_suggestions(self, game_name):
+        # Use their search API
+        try:
+            data = self.http.get_json({"action": "query", "list": "search", "srsearch": game_name, "srlimit": 10})
+            if "query" not in data or "search" not in data["query"]:
+                return []
+                
+            suggestions = []
+            for item in data["query"]["search"]:
+                title = item["title"]
+                # Clean up title 
+                if "(" in title and ")" in title:
+                    title = title.split("(")[0].strip()
+                suggestions.append(title)
+                
+            return suggestions
+        except WikiError:
+            raise
+        except Exception as e:
+            print(f"Search suggestions failed: {e}", file=sys.stderr)
+            return []
+    
+    def get_similar_games(self, game_name):
+        """Get similar games (excluding exact match)"""
+        # Get suggestions
+        suggestions = self.search_suggestions(game_name)
+        
+        if not suggestions:
+            return []
+        
+        # Filter out exact matches 
+        exact_match = game_name.strip().lower()
+        similar_games = []
+        
+        for suggestion in suggestions:
+            # Skip if it's an exact match 
+            if suggestion.lower() == exact_match:
+                continue
+            # Skip if it's very similar (e.g., "Game" vs "Game 2")
+            if len(suggestion) > 0 and len(exact_match) > 0:
+                # Simple similarity check: if suggestion contains the game name or vice versa
+                if (exact_match in suggestion.lower() or suggestion.lower() in exact_match) and abs(len(suggestion) - len(exact_match)) <= 3:
+                    continue
+            similar_games.append(suggestion)
+        
+        # If we have too many similar games, limit to 5
+        return similar_games[:5] if similar_games else []
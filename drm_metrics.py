@@ -0,0 +1,150 @@
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+
+class Metrics:
+    """Per-stage timings and counters for one session, safe to share between threads.
+
+    Every finished stage updates a running count/total/max. With a log
+    stream set, each one is also written as a JSON line, e.g.
+    {"ts": 1718000000.123, "stage": "http", "ms": 84.2, "bytes": 51234, "thread": "drm-lookup_0"}
+    """
+
+    def __init__(self, log=None):
+        self.log = log
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._stages = {}
+        self._counters = {}
+
+    @contextmanager
+    def stage(self, name, **fields):
+        """Time the block as stage name; the yielded dict takes extra fields for the log line"""
+        start = time.perf_counter()
+        try:
+            yield fields
+        finally:
+            self.record(name, time.perf_counter() - start, **fields)
+
+    def record(self, name, seconds, **fields):
+        with self._lock:
+            totals = self._stages.get(name)
+            if totals is None:
+                totals = self._stages[name] = [0, 0.0, 0.0]
+            totals[0] += 1
+            totals[1] += seconds
+            totals[2] = max(totals[2], seconds)
+            if self.log is not None:
+                line = dict(ts=round(time.time(), 3), stage=name, ms=round(seconds * 1000, 3),
+                            thread=threading.current_thread().name, **fields)
+                self.log.write(json.dumps(line, default=str) + "\n")
+                self.log.flush()
+
+    def count(self, name, n=1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def snapshot(self, **extra):
+        """Plain dict of everything recorded so far, plus any extra sections"""
+        with self._lock:
+            stages = {
+                name: {"count": count, "total_ms": round(total * 1000, 3),
+                       "mean_ms": round(total * 1000 / count, 3), "max_ms": round(peak * 1000, 3)}
+                for name, (count, total, peak) in sorted(self._stages.items())
+            }
+            counters = dict(sorted(self._counters.items()))
+        return dict({"uptime_s": round(time.time() - self.started, 3), "stages": stages,
+                     "counters": counters}, **extra)
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+            self._counters.clear()
+            self.started = time.time()
+
+
+def save_snapshot(snapshot, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(snapshot, f, indent=1)
+
+
+def add_arguments(parser):
+    """The instrumentation options shared by the GUI and batch command lines"""
+    parser.add_argument("--metrics", metavar="PATH", help="write stage timings and counters as JSON on exit")
+    parser.add_argument("--metrics-log", metavar="PATH",
+                        help="append a JSON line per timed stage ('-' for stderr)")
+    parser.add_argument("--profile", metavar="PATH", help="write cProfile stats for the whole session")
+
+
+def open_log(path):
+    if not path:
+        return None
+    if path == "-":
+        return sys.stderr
+    return open(path, "a", encoding="utf-8")
+
+
+# From 3.12 cProfile runs on sys.monitoring: one profiler sees every thread,
+# and a second one can't be enabled while it is active
+PROFILE_ALL_THREADS = sys.version_info >= (3, 12)
+
+
+class SessionProfiler:
+    """cProfile over the calling thread and every thread started while it runs.
+
+    Before Python 3.12 cProfile only sees the thread that enabled it, and
+    lookups happen on worker threads, so each new thread gets its own
+    profiler and the stats are merged when the session ends.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._profiles = []
+
+    def _begin(self):
+        import cProfile
+        profile = cProfile.Profile()
+        with self._lock:
+            self._profiles.append(profile)
+        profile.enable()
+
+    def _thread_started(self, frame, event, arg):
+        # Runs once as the new thread's profile hook, then hands over to cProfile
+        sys.setprofile(None)
+        self._begin()
+
+    def start(self):
+        if not PROFILE_ALL_THREADS:
+            threading.setprofile(self._thread_started)
+        self._begin()
+
+    def stop(self, path):
+        """Stop profiling and write the merged stats to path (readable with pstats or snakeviz)"""
+        if not PROFILE_ALL_THREADS:
+            threading.setprofile(None)
+        with self._lock:
+            profiles, self._profiles = self._profiles, []
+        for profile in profiles:
+            profile.disable()
+        import pstats
+        stats = pstats.Stats(*profiles)
+        stats.dump_stats(path)
+        return stats
+
+
+@contextmanager
+def profiled(path):
+    """Profile the block (and threads it starts) into path; does nothing when path is empty"""
+    if not path:
+        yield None
+        return
+    profiler = SessionProfiler()
+    profiler.start()
+    try:
+        yield profiler
+    finally:
+        profiler.stop(path)
+        print(f"Profile written to {path}", file=sys.stderr)
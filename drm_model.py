@@ -0,0 +1,322 @@
+import argparse
+import gzip
+import json
+import struct
+import sys
+from array import array
+from enum import Enum, IntFlag
+
+# Columnar file layout: magic, header length, JSON header, then raw column bytes
+FORMAT_TAG = b"DRMC"
+MAGIC = FORMAT_TAG + b"\x02"
+HEADER_LEN = struct.Struct("<I")
+STATUSES = ("found", "suggestions", "not_found", "error")
+STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+# Separates the strings of one text column; extracted text never contains it
+STRING_SEP = "\x00"
+# Stands for a None value in text columns (additional_info is None for Cargo results)
+NONE_MARK = "\x01"
+
+
+class Protection(str, Enum):
+    """Protection labels the extractors produce; anything else is OTHER with the raw text kept"""
+    STEAMWORKS = "Steamworks DRM"
+    DENUVO = "Denuvo"
+    NONE = "No protection"
+    NOT_SPECIFIED = "Not specified"
+    OTHER = "Other"
+
+    @classmethod
+    def parse(cls, label):
+        try:
+            return cls(label)
+        except ValueError:
+            return cls.OTHER
+
+
+class OS(IntFlag):
+    WINDOWS = 1
+    MAC = 2
+    LINUX = 4
+
+    @classmethod
+    def from_names(cls, names):
+        return OS_FLAGS[os_bits(names)]
+
+    def names(self):
+        return list(OS_LISTS[self])
+
+
+# Plain ints: IntFlag arithmetic is slow in per-row loops
+OS_BITS = {"Windows": 1, "Mac": 2, "Linux": 4}
+# Every flag combination's name list, in display order; built once, copied on use
+OS_LISTS = tuple(tuple(name for name, bit in OS_BITS.items() if bits & bit) for bits in range(8))
+OS_FLAGS = tuple(OS(bits) for bits in range(8))
+# Protection column codes
+PROTECTIONS = tuple(Protection)
+PROTECTION_CODES = {protection: code for code, protection in enumerate(PROTECTIONS)}
+
+
+def os_bits(names):
+    bits = 0
+    for name in names:
+        bits |= OS_BITS.get(name, 0)
+    return bits
+
+
+class StringTable:
+    """Interns repeated strings (store names, DRM values) as small integer ids"""
+
+    __slots__ = ('values', '_ids')
+
+    def __init__(self, values=()):
+        self.values = list(values)
+        self._ids = {value: i for i, value in enumerate(self.values)}
+
+    def add(self, value):
+        i = self._ids.get(value)
+        if i is None:
+            i = self._ids[value] = len(self.values)
+            self.values.append(value)
+        return i
+
+    def __len__(self):
+        return len(self.values)
+
+
+class StoreRow:
+    """One line of a game's availability table"""
+
+    __slots__ = ('source', 'drm', 'notes', 'os')
+
+    def __init__(self, source, drm="", notes="", os=OS(0)):
+        self.source = sys.intern(source)
+        self.drm = sys.intern(drm)
+        self.notes = notes
+        self.os = os
+
+    @classmethod
+    def from_dict(cls, entry):
+        return cls(entry.get('source', ''), entry.get('drm', ''), entry.get('notes', ''),
+                   OS.from_names(entry.get('os', ())))
+
+    def to_dict(self):
+        return {'source': self.source, 'drm': self.drm, 'notes': self.notes, 'os': list(OS_LISTS[self.os])}
+
+
+class DRMResult:
+    """Typed form of a lookup result: the same fields the GUI and exports show"""
+
+    __slots__ = ('game', 'protection', 'protection_text', 'availability', 'additional_info')
+
+    def __init__(self, game, protection, availability=(), additional_info=None):
+        self.game = game
+        self.protection = Protection.parse(protection)
+        # Raw label for protections outside the enum (e.g. "Rockstar Games Launcher")
+        self.protection_text = protection if self.protection is Protection.OTHER else None
+        self.availability = tuple(availability)
+        self.additional_info = additional_info
+
+    @property
+    def label(self):
+        return self.protection_text if self.protection is Protection.OTHER else self.protection.value
+
+    @classmethod
+    def from_dict(cls, result):
+        return cls(result['game'], result['protection'],
+                   [StoreRow.from_dict(entry) for entry in result.get('availability') or ()],
+                   result.get('additional_info'))
+
+    def to_dict(self):
+        return {'game': self.game, 'protection': self.label,
+                'availability': [row.to_dict() for row in self.availability],
+                'additional_info': self.additional_info}
+
+
+class ResultTable:
+    """Column-oriented set of batch records for whole catalogs.
+
+    Found results are stored in their typed form (DRMResult): a Protection
+    code per record, interned store/DRM ids and OS flags per availability
+    row, all in flat arrays instead of one dict per record and per store.
+    The table saves to and loads from a compact binary file (.drmc,
+    gzipped if named .gz). Records go in and come out either as
+    DRMResults or in the same dict shape batch mode writes.
+    """
+
+    def __init__(self):
+        self.inputs = []
+        self.games = []
+        self.infos = []
+        self.status = array("B")
+        self.protection = array("B")
+        # Raw label of OTHER protections, as an id into others (0: none)
+        self.other = array("I")
+        self.others = StringTable([""])
+        self.stores = StringTable()
+        self.drms = StringTable()
+        self.notes = StringTable()
+        # Availability rows of record i are [row_start[i], row_start[i + 1])
+        self.row_start = array("I", [0])
+        self.row_store = array("I")
+        self.row_drm = array("I")
+        self.row_notes = array("I")
+        self.row_os = array("B")
+        # Fields most records don't have (suggestions, error, appid...) as {key: {row: value}}
+        self.sparse = {}
+
+    def __len__(self):
+        return len(self.inputs)
+
+    def append(self, record):
+        """Add a record in the dict shape batch mode writes"""
+        found = record["status"] == "found"
+        self.append_result(record["input"], DRMResult.from_dict(record) if found else None, record["status"],
+                           **{key: record[key] for key in record.keys() - RECORD_KEYS})
+
+    def append_result(self, title, result, status="found", **extra):
+        """Add the lookup result for title (None unless found), plus sparse fields like suggestions"""
+        i = len(self.inputs)
+        self.inputs.append(title)
+        self.status.append(STATUS_CODES[status])
+        if result is None:
+            self.games.append("")
+            self.infos.append(NONE_MARK)
+            self.protection.append(0)
+            self.other.append(0)
+        else:
+            self.games.append(result.game)
+            self.infos.append(NONE_MARK if result.additional_info is None else result.additional_info)
+            self.protection.append(PROTECTION_CODES[result.protection])
+            self.other.append(0 if result.protection_text is None else self.others.add(result.protection_text))
+            add_store, add_drm, add_notes = self.stores.add, self.drms.add, self.notes.add
+            for row in result.availability:
+                self.row_store.append(add_store(row.source))
+                self.row_drm.append(add_drm(row.drm))
+                self.row_notes.append(add_notes(row.notes))
+                self.row_os.append(row.os)
+        self.row_start.append(len(self.row_store))
+        for key, value in extra.items():
+            self.sparse.setdefault(key, {})[i] = value
+
+    def extend(self, records):
+        for record in records:
+            self.append(record)
+
+    def record(self, i):
+        """Record i as the same dict (down to key order) batch mode writes"""
+        status = STATUSES[self.status[i]]
+        result = self.result(i)
+        record = result.to_dict() if result else {}
+        record["input"] = self.inputs[i]
+        record["status"] = status
+        for key, values in self.sparse.items():
+            if i in values:
+                record[key] = values[i]
+        return record
+
+    def result(self, i):
+        """Record i as a DRMResult, or None unless it was found"""
+        if STATUSES[self.status[i]] != "found":
+            return None
+        stores, drms, notes = self.stores.values, self.drms.values, self.notes.values
+        protection = PROTECTIONS[self.protection[i]]
+        info = self.infos[i]
+        return DRMResult(self.games[i],
+                         self.others.values[self.other[i]] if protection is Protection.OTHER else protection.value,
+                         [StoreRow(stores[self.row_store[r]], drms[self.row_drm[r]], notes[self.row_notes[r]],
+                                   OS_FLAGS[self.row_os[r]])
+                          for r in range(self.row_start[i], self.row_start[i + 1])],
+                         None if info == NONE_MARK else info)
+
+    def __iter__(self):
+        return (self.record(i) for i in range(len(self)))
+
+    def save(self, path):
+        arrays = {name: getattr(self, name) for name in ARRAY_COLUMNS}
+        texts = {"inputs": self.inputs, "games": self.games, "infos": self.infos,
+                 "others": self.others.values, "stores": self.stores.values,
+                 "drms": self.drms.values, "notes": self.notes.values}
+        blobs = {name: STRING_SEP.join(values).encode("utf-8") for name, values in texts.items()}
+        header = {
+            "rows": len(self),
+            "byteorder": sys.byteorder,
+            "arrays": [[name, arr.typecode, len(arr)] for name, arr in arrays.items()],
+            "texts": [[name, len(values), len(blobs[name])] for name, values in texts.items()],
+            "sparse": {key: [[i, value] for i, value in values.items()] for key, values in self.sparse.items()},
+        }
+        header_bytes = json.dumps(header, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "wb") as f:
+            f.write(MAGIC + HEADER_LEN.pack(len(header_bytes)) + header_bytes)
+            for arr in arrays.values():
+                f.write(arr.tobytes())
+            for blob in blobs.values():
+                f.write(blob)
+
+    @classmethod
+    def load(cls, path):
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rb") as f:
+            data = f.read()
+        if not data.startswith(MAGIC):
+            if data.startswith(FORMAT_TAG):
+                raise ValueError(f"{path} was written by another version of the result table format")
+            raise ValueError(f"{path} is not a DRM result table")
+        pos = len(MAGIC)
+        (header_len,) = HEADER_LEN.unpack_from(data, pos)
+        pos += HEADER_LEN.size
+        header = json.loads(data[pos:pos + header_len].decode("utf-8"))
+        pos += header_len
+
+        table = cls()
+        for name, typecode, count in header["arrays"]:
+            arr = array(typecode)
+            nbytes = count * arr.itemsize
+            arr.frombytes(data[pos:pos + nbytes])
+            if header["byteorder"] != sys.byteorder:
+                arr.byteswap()
+            setattr(table, name, arr)
+            pos += nbytes
+        texts = {}
+        for name, count, nbytes in header["texts"]:
+            texts[name] = data[pos:pos + nbytes].decode("utf-8").split(STRING_SEP) if count else []
+            pos += nbytes
+        table.inputs, table.games, table.infos = texts["inputs"], texts["games"], texts["infos"]
+        table.others = StringTable(texts["others"])
+        # Interned like freshly extracted rows, so every StoreRow shares one copy per name
+        table.stores = StringTable(sys.intern(value) for value in texts["stores"])
+        table.drms = StringTable(sys.intern(value) for value in texts["drms"])
+        table.notes = StringTable(texts["notes"])
+        table.sparse = {key: {i: value for i, value in values} for key, values in header["sparse"].items()}
+        return table
+
+
+RECORD_KEYS = frozenset({"input", "status", "game", "protection", "availability", "additional_info"})
+ARRAY_COLUMNS = ("status", "protection", "other", "row_start", "row_store", "row_drm", "row_notes", "row_os")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert batch results between JSON lines and the columnar format.")
+    parser.add_argument("source", help="results file (.jsonl, or .drmc / .drmc.gz)")
+    parser.add_argument("target", help="file to write; the format follows the extension")
+    args = parser.parse_args(argv)
+
+    if args.source.endswith((".drmc", ".drmc.gz")):
+        table = ResultTable.load(args.source)
+    else:
+        table = ResultTable()
+        with open(args.source, encoding="utf-8") as f:
+            table.extend(json.loads(line) for line in f if line.strip())
+    if args.target.endswith((".drmc", ".drmc.gz")):
+        table.save(args.target)
+    else:
+        with open(args.target, "w", encoding="utf-8") as f:
+            for record in table:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    print(f"{len(table)} records written to {args.target}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
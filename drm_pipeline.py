@@ -0,0 +1,70 @@
+import os
+import threading
+
+from drm_extract import extract_response
+
+
+class ExtractorError(Exception):
+    """The worker pool itself failed (a worker died, a body couldn't be sent); not a problem with the page"""
+
+
+class PageError(Exception):
+    """Extraction of one page failed in a worker"""
+
+
+def default_processes():
+    return os.cpu_count() or 1
+
+
+def extract_in_worker(raw, title):
+    """extract_response, with page errors returned as text so they can't be mistaken for pool failures"""
+    try:
+        return extract_response(raw, title), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+class ProcessExtractor:
+    """Run article extraction in a pool of worker processes.
+
+    Plug it into DRMLookup(extractor=...): fetch threads keep doing the
+    network I/O and hand each raw response body (bytes, pickled as one
+    buffer) to a worker, which decodes, parses and classifies it and sends
+    back only the small result dict. Regex-heavy parsing holds the GIL, so
+    this is what spreads it over several cores.
+
+    At most max_pending bodies are queued for the pool; fetch threads
+    wanting to add more block until a worker catches up, which in turn
+    stops them downloading more pages than the pool can keep up with.
+    """
+
+    def __init__(self, processes=None, max_pending=None):
+        # Imported here: batch runs without -p shouldn't load multiprocessing at all
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        self.processes = processes or default_processes()
+        # spawn everywhere: forking a process that already runs fetch threads isn't safe,
+        # and it's what Windows does anyway
+        self.pool = ProcessPoolExecutor(max_workers=self.processes,
+                                        mp_context=multiprocessing.get_context("spawn"))
+        self._slots = threading.BoundedSemaphore(max_pending or self.processes * 2)
+
+    def __call__(self, raw, title):
+        with self._slots:
+            try:
+                extracted, error = self.pool.submit(extract_in_worker, raw, title).result()
+            except Exception as e:
+                raise ExtractorError(f"Extraction pool failed: {e}") from e
+        if error:
+            raise PageError(error)
+        return extracted
+
+    def close(self):
+        self.pool.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,115 @@
+import queue
+import sys
+import threading
+from concurrent.futures import Future
+
+# Defaults: only the first few entries, one at a time, and at most ~4 MB per list
+PREFETCH_ITEMS = 3
+PREFETCH_WORKERS = 1
+PREFETCH_BYTES = 4 * 1024 * 1024
+
+
+class BackgroundExecutor:
+    """Small thread pool for the GUI whose workers are daemon threads.
+
+    ThreadPoolExecutor joins its workers when the interpreter exits, so
+    closing the window would wait for in-flight lookups (up to retries x
+    timeout). Results are only wanted while the window is open, so here
+    running calls are simply abandoned on exit.
+    """
+
+    def __init__(self, max_workers, thread_name_prefix):
+        self._queue = queue.SimpleQueue()
+        self._workers = max_workers
+        for i in range(max_workers):
+            threading.Thread(target=self._work, name=f"{thread_name_prefix}_{i}", daemon=True).start()
+
+    def submit(self, fn, *args):
+        future = Future()
+        self._queue.put((future, fn, args))
+        return future
+
+    def _work(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            future, fn, args = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                result = fn(*args)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+
+    def shutdown(self):
+        """Cancel queued calls and stop the workers; running calls aren't waited for"""
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                item[0].cancel()
+        for _ in range(self._workers):
+            self._queue.put(None)
+
+
+class Prefetcher:
+    """Speculatively look up titles the user is likely to click next.
+
+    Results land in the lookup's memo and cache, so a later real lookup is
+    served locally. Runs on its own small pool so it never holds up user
+    searches, and stops once the byte budget for the current list is spent.
+    """
+
+    def __init__(self, lookup, max_items=PREFETCH_ITEMS, max_workers=PREFETCH_WORKERS,
+                 max_bytes=PREFETCH_BYTES):
+        self.lookup = lookup
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.executor = BackgroundExecutor(max_workers, thread_name_prefix="drm-prefetch")
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._spent = 0
+        self._futures = []
+
+    def prefetch(self, titles):
+        """Replace any pending prefetches with the top entries of titles"""
+        with self._lock:
+            self._cancel_locked()
+            generation = self._generation
+            self._futures = [self.executor.submit(self._fetch, generation, title)
+                             for title in list(titles)[:self.max_items]]
+
+    def cancel(self):
+        """Drop queued prefetches; ones already downloading finish but nothing new starts"""
+        with self._lock:
+            self._cancel_locked()
+
+    def _cancel_locked(self):
+        self._generation += 1
+        self._spent = 0
+        for future in self._futures:
+            future.cancel()
+        self._futures = []
+
+    def _fetch(self, generation, title):
+        with self._lock:
+            if generation != self._generation or self._spent >= self.max_bytes:
+                return
+        http = self.lookup.http
+        before = http.thread_bytes()
+        try:
+            self.lookup.get_drm_info(title)
+        except Exception as e:
+            print(f"Prefetch of {title} failed: {e}", file=sys.stderr)
+        with self._lock:
+            if generation == self._generation:
+                self._spent += http.thread_bytes() - before
+
+    def shutdown(self):
+        self.cancel()
+        self.executor.shutdown()
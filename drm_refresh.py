@@ -0,0 +1,169 @@
+import argparse
+import sys
+import time
+from calendar import timegm
+
+from drm_bulk import BATCH_SIZE, chunked, follow_redirects
+from drm_cache import normalize_title
+from drm_http import API_URL, WikiClient
+from drm_lookup import DRMLookup
+
+SYNC_KEY = "recentchanges_synced_at"
+
+# Only trust the recent-changes feed this far back; MediaWiki prunes it after
+# $wgRCMaxAge (90 days by default), older syncs compare revision IDs instead
+RC_MAX_AGE = 30 * 24 * 60 * 60
+# Start each feed query a little before the last sync to allow for clock skew
+RC_OVERLAP = 5 * 60
+# Log actions after which cached rows for the page can't be trusted at all
+DROP_LOG_TYPES = frozenset({"delete", "move", "merge"})
+
+
+def wiki_timestamp(seconds):
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(seconds))
+
+
+def parse_wiki_timestamp(value):
+    return timegm(time.strptime(value, "%Y-%m-%dT%H:%M:%SZ"))
+
+
+class CacheRefresher:
+    """Bring cached results up to date by re-fetching only pages edited since they were stored.
+
+    With a recent sync, one recent-changes feed query (500 edits each)
+    covers the whole cache. Otherwise the latest revision of every cached
+    page is compared in batches of 50. Rows still current are marked as
+    fresh so their TTL doesn't force a download either.
+    """
+
+    def __init__(self, lookup, batch_size=BATCH_SIZE):
+        if not lookup.cache:
+            raise ValueError("Refreshing needs the result cache")
+        self.lookup = lookup
+        self.cache = lookup.cache
+        self.http = lookup.http
+        self.batch_size = batch_size
+
+    def changes_since(self, since):
+        """{page: (latest revid, edited at)} and the set of moved/deleted pages, from the feed"""
+        edited = {}
+        dropped = set()
+        params = {"action": "query", "list": "recentchanges", "rcnamespace": 0, "rcdir": "newer",
+                  "rcstart": wiki_timestamp(since), "rctype": "edit|new|log",
+                  "rcprop": "title|ids|timestamp|loginfo", "rclimit": "max"}
+        while True:
+            data = self.http.get_json(params)
+            for change in data.get("query", {}).get("recentchanges", []):
+                page = normalize_title(change["title"])
+                if change.get("type") == "log":
+                    if change.get("logtype") in DROP_LOG_TYPES:
+                        dropped.add(page)
+                elif change.get("revid"):
+                    edited[page] = (change["revid"], parse_wiki_timestamp(change["timestamp"]))
+            cont = data.get("continue")
+            if not cont:
+                return edited, dropped
+            params = dict(params, **cont)
+
+    def latest_revisions(self, pages):
+        """{page: (latest revid, edited at)} for pages that exist, following redirects"""
+        latest = {}
+        for chunk in chunked(pages, self.batch_size):
+            data = self.http.get_json({"action": "query", "prop": "revisions", "rvprop": "ids|timestamp",
+                                       "titles": "|".join(chunk), "redirects": 1})
+            query = data.get("query", {})
+            revisions = {entry["title"]: entry["revisions"][0]
+                         for entry in query.get("pages", {}).values() if entry.get("revisions")}
+            for page, target in follow_redirects(query, chunk).items():
+                if target in revisions:
+                    revision = revisions[target]
+                    latest[page] = (revision["revid"], parse_wiki_timestamp(revision["timestamp"]))
+        return latest
+
+    def refresh(self, full_check=False, progress=None):
+        """Re-fetch stale pages; returns a summary (mode, pages, rows, refreshed, dropped, failed...)"""
+        started = time.time()
+        retries_before = self.http.retry_count
+        rows = self.cache.entries()
+        by_page = {}
+        for title, page, revid, fetched_at in rows:
+            by_page.setdefault(page, []).append((title, revid, fetched_at))
+
+        last_sync = float(self.cache.get_meta(SYNC_KEY, 0))
+        use_feed = not full_check and last_sync and started - last_sync < RC_MAX_AGE
+        if use_feed:
+            edited, dropped = self.changes_since(last_sync - RC_OVERLAP)
+            edited = {page: rev for page, rev in edited.items() if page in by_page}
+        else:
+            latest = self.latest_revisions(sorted(by_page))
+            edited = latest
+            # Cached pages the wiki no longer has
+            dropped = {page for page in by_page if page not in latest}
+
+        stale = set()
+        for page, (revid, edited_at) in edited.items():
+            if page in dropped:
+                continue
+            for title, cached_revid, fetched_at in by_page[page]:
+                # Rows from before revision tracking only have their download time to go by
+                if cached_revid is None and fetched_at < edited_at or \
+                        cached_revid is not None and cached_revid != revid:
+                    stale.add(page)
+                    break
+
+        for page in dropped & by_page.keys():
+            for title, _, _ in by_page[page]:
+                self.cache.delete(title)
+
+        refreshed = 0
+        failed = []
+        for done, page in enumerate(sorted(stale), 1):
+            try:
+                result = self.lookup.try_get_drm_info(page, refresh=True)
+            except Exception as e:
+                print(f"Refreshing {page} failed: {e}", file=sys.stderr)
+                failed.append(page)
+                continue
+            if result:
+                info = self.cache.info(page)
+                for title, _, _ in by_page[page]:
+                    if normalize_title(title) != normalize_title(page):
+                        self.cache.put(title, result, page=page, revid=info[1] if info else None)
+                refreshed += 1
+            if progress:
+                progress(done, len(stale))
+
+        # Everything else was verified against the wiki just now
+        current = [title for page, entries in by_page.items()
+                   if page not in dropped and page not in stale for title, _, _ in entries]
+        self.cache.touch(current, fetched_at=started)
+        if not failed:
+            self.cache.set_meta(SYNC_KEY, started)
+        return {"mode": "recentchanges" if use_feed else "revisions", "pages": len(by_page),
+                "rows": len(rows), "refreshed": refreshed, "dropped": len(dropped & by_page.keys()),
+                "failed": len(failed), "retries": self.http.retry_count - retries_before,
+                "seconds": round(time.time() - started, 2)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-fetch cached results whose wiki pages changed.")
+    parser.add_argument("--full-check", action="store_true",
+                        help="compare every page's latest revision instead of reading the recent-changes feed")
+    parser.add_argument("--api-url", default=API_URL, help="MediaWiki api.php endpoint")
+    args = parser.parse_args(argv)
+
+    lookup = DRMLookup(http=WikiClient(api_url=args.api_url))
+    try:
+        refresher = CacheRefresher(lookup)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+    summary = refresher.refresh(
+        full_check=args.full_check,
+        progress=lambda done, total: print(f"{done}/{total} refreshed", file=sys.stderr, flush=True))
+    print(", ".join(f"{key}: {value}" for key, value in summary.items()), file=sys.stderr)
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+import tkinter as tk
+from bisect import bisect_left, bisect_right
+from tkinter import ttk
+
+ALL_PROTECTIONS = "All"
+
+# Rows inserted right away; the rest are added in slices between Tk events
+FIRST_SLICE = 100
+SLICE_SIZE = 500
+
+# Same color coding as the single-game header
+PROTECTION_TAGS = {"No protection": ("free", "#27ae60"), "Denuvo": ("denuvo", "#e74c3c")}
+DEFAULT_TAG = ("drm", "#3498db")
+
+
+def os_text(os_list):
+    return " ".join(os_list)
+
+
+def sort_key(value):
+    return str(value).lower()
+
+
+class ResultsTable(tk.Frame):
+    """Sortable, filterable result table backed by a ttk.Treeview.
+
+    Rows are plain tuples kept in Python; the Treeview only holds the rows
+    passing the current filter, and they are inserted in slices from the
+    Tk loop so a new table shows up at once no matter how long it is.
+    """
+
+    def __init__(self, parent, columns, protection_column=None, height=10, filterable=False, **kwargs):
+        super().__init__(parent, bg=kwargs.pop("bg", "#ffffff"), **kwargs)
+        self.columns = [name for name, _ in columns]
+        self.protection_column = protection_column
+        self.rows = []
+        self.protections = set()
+        self.visible_count = 0
+        self.sort_column = None
+        self.sort_reverse = False
+        self._fill_job = None
+        self._pending = []
+        # Rows already in the Treeview (the rest of the visible ones wait in _pending)
+        self._inserted = 0
+        # Ascending sort keys of every visible row while a column is sorted
+        self._keys = []
+
+        if filterable:
+            bar = tk.Frame(self, bg=self["bg"])
+            bar.pack(fill=tk.X, pady=(0, 5))
+            tk.Label(bar, text="Protection:", bg=self["bg"]).pack(side=tk.LEFT)
+            self.filter_var = tk.StringVar(value=ALL_PROTECTIONS)
+            self.filter_box = ttk.Combobox(bar, textvariable=self.filter_var, state="readonly",
+                                           values=[ALL_PROTECTIONS], width=25)
+            self.filter_box.pack(side=tk.LEFT, padx=5)
+            self.filter_box.bind("<<ComboboxSelected>>", lambda e: self.refresh())
+            self.count_label = tk.Label(bar, text="", bg=self["bg"], fg="gray")
+            self.count_label.pack(side=tk.RIGHT)
+        else:
+            self.filter_var = None
+            self.count_label = None
+
+        self.tree = ttk.Treeview(self, columns=self.columns, show="headings", height=height)
+        for name, width in columns:
+            self.tree.heading(name, text=name, command=lambda c=name: self.sort_by(c))
+            self.tree.column(name, width=width, stretch=True, anchor="w")
+        for tag, color in list(PROTECTION_TAGS.values()) + [DEFAULT_TAG]:
+            self.tree.tag_configure(tag, foreground=color)
+
+        scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+    def set_rows(self, rows):
+        self.rows = []
+        self.protections = set()
+        self.add_rows(rows, redraw=True)
+
+    def add_rows(self, rows, redraw=False):
+        """Append rows (e.g. streaming batch results) without redrawing the rest"""
+        rows = list(rows)
+        self.rows.extend(rows)
+        self._update_filter_choices(rows)
+        if redraw:
+            self.refresh()
+            return
+        visible = [row for row in rows if self._matches(row)]
+        self.visible_count += len(visible)
+        if self.sort_column is not None:
+            self._place_sorted(visible)  # Keep the current sort order
+        else:
+            self._queue(visible)
+        self._update_count()
+
+    def sort_by(self, column):
+        if self.sort_column == column:
+            self.sort_reverse = not self.sort_reverse
+        else:
+            self.sort_column, self.sort_reverse = column, False
+        for name in self.columns:
+            arrow = (" ▼" if self.sort_reverse else " ▲") if name == column else ""
+            self.tree.heading(name, text=name + arrow)
+        self.refresh()
+
+    def refresh(self):
+        """Rebuild the visible rows from the data with the current filter and sort"""
+        if self._fill_job is not None:
+            self.after_cancel(self._fill_job)
+            self._fill_job = None
+        self._pending = []
+        self._inserted = 0
+        self.tree.delete(*self.tree.get_children())
+        rows = [row for row in self.rows if self._matches(row)]
+        if self.sort_column is not None:
+            i = self.columns.index(self.sort_column)
+            rows.sort(key=lambda row: sort_key(row[i]), reverse=self.sort_reverse)
+            self._keys = sorted(sort_key(row[i]) for row in rows)
+        self.visible_count = len(rows)
+        self._queue(rows)
+        self._update_count()
+
+    def _place_sorted(self, rows):
+        """Insert new rows at their sorted positions instead of rebuilding the whole table"""
+        i = self.columns.index(self.sort_column)
+        for row in rows:
+            key = sort_key(row[i])
+            # New rows go after equal ones, as a stable sort of the whole list would put them
+            if self.sort_reverse:
+                pos = bisect_left(self._keys, key)
+                index = len(self._keys) - pos
+            else:
+                pos = bisect_right(self._keys, key)
+                index = pos
+            self._keys.insert(pos, key)
+            if index <= self._inserted:
+                self._insert_row(row, index)
+            else:
+                # Still being filled in slices: take its place in the queue
+                self._pending.insert(index - self._inserted, row)
+                if self._fill_job is None:
+                    self._fill_job = self.after_idle(self._fill)
+
+    def _matches(self, row):
+        if self.filter_var is None or self.protection_column is None:
+            return True
+        wanted = self.filter_var.get()
+        return wanted == ALL_PROTECTIONS or row[self.columns.index(self.protection_column)] == wanted
+
+    def _queue(self, rows):
+        if not self._pending and self._fill_job is None:
+            self._insert(rows[:FIRST_SLICE])
+            rows = rows[FIRST_SLICE:]
+        self._pending.extend(rows)
+        if self._pending and self._fill_job is None:
+            self._fill_job = self.after_idle(self._fill)
+
+    def _fill(self):
+        self._fill_job = None
+        chunk, self._pending = self._pending[:SLICE_SIZE], self._pending[SLICE_SIZE:]
+        self._insert(chunk)
+        if self._pending:
+            self._fill_job = self.after(1, self._fill)
+
+    def _insert(self, rows):
+        for row in rows:
+            self._insert_row(row)
+
+    def _insert_row(self, row, index=tk.END):
+        column = self.columns.index(self.protection_column) if self.protection_column else None
+        tag = PROTECTION_TAGS.get(row[column], DEFAULT_TAG)[0] if column is not None else ""
+        self.tree.insert("", index, values=row, tags=(tag,))
+        self._inserted += 1
+
+    def _update_filter_choices(self, new_rows):
+        if self.filter_var is None or self.protection_column is None:
+            return
+        i = self.columns.index(self.protection_column)
+        before = len(self.protections)
+        self.protections.update(row[i] for row in new_rows if row[i])
+        if len(self.protections) != before:
+            self.filter_box.configure(values=[ALL_PROTECTIONS] + sorted(self.protections))
+
+    def _update_count(self):
+        if self.count_label is not None:
+            self.count_label.configure(text=f"{self.visible_count} of {len(self.rows)} games")
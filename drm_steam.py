@@ -0,0 +1,314 @@
+import argparse
+import json
+import os
+import re
+import sys
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from drm_batch import WRITERS, BatchStats, check_title, make_record
+from drm_bulk import BATCH_SIZE, BulkResolver
+from drm_cache import user_data_dir
+from drm_http import API_URL, WikiClient
+from drm_lookup import DRMLookup
+
+STATE_FILE = "steam_library.json"
+STATE_VERSION = 1
+
+# Quoted string, brace, // comment or bare word; Valve's text format has nothing else
+VDF_TOKEN_RE = re.compile(r'"((?:[^"\\]|\\.)*)"|([{}])|//[^\n]*|([^\s{}"]+)')
+VDF_ESCAPES = {"n": "\n", "t": "\t", "\\": "\\", '"': '"'}
+VDF_ESCAPE_RE = re.compile(r'\\(.)')
+MANIFEST_RE = re.compile(r'appmanifest_(\d+)\.acf$', re.IGNORECASE)
+
+
+class VDFError(ValueError):
+    pass
+
+
+def vdf_tokens(stream):
+    """Yield (is_brace, text) tokens from a VDF/ACF text stream, one line at a time"""
+    for line_no, line in enumerate(stream, 1):
+        pos = 0
+        for match in VDF_TOKEN_RE.finditer(line):
+            if line[pos:match.start()].strip():
+                break
+            pos = match.end()
+            quoted, brace, bare = match.groups()
+            if quoted is not None:
+                yield False, VDF_ESCAPE_RE.sub(lambda m: VDF_ESCAPES.get(m.group(1), m.group(0)), quoted)
+            elif brace:
+                yield True, brace
+            elif bare is not None and not bare.startswith("["):  # [$WIN32] conditionals are ignored
+                yield False, bare
+        rest = line[pos:].strip()
+        if rest:
+            # The token pattern only skips text when a quote is never closed
+            raise VDFError(f"line {line_no}: unterminated string {rest[:40]!r}")
+
+
+def load_vdf(stream):
+    """Parse a VDF stream into nested dicts. Keys are lowercased: Steam treats them case-insensitively."""
+    root = {}
+    stack = [root]
+    key = None
+    for is_brace, text in vdf_tokens(stream):
+        if is_brace and text == "{":
+            if key is None:
+                raise VDFError("section without a name")
+            section = stack[-1].setdefault(key, {})
+            if not isinstance(section, dict):
+                section = stack[-1][key] = {}
+            stack.append(section)
+            key = None
+        elif is_brace:
+            if key is not None or len(stack) == 1:
+                raise VDFError("unbalanced '}'")
+            stack.pop()
+        elif key is None:
+            key = text.lower()
+        else:
+            stack[-1][key] = text
+            key = None
+    if len(stack) != 1 or key is not None:
+        raise VDFError("unexpected end of file")
+    return root
+
+
+def read_vdf(path):
+    with open(path, encoding="utf-8", errors="replace") as f:
+        return load_vdf(f)
+
+
+def default_steam_root():
+    """Best guess at the Steam install directory, or None"""
+    candidates = []
+    if sys.platform == "win32":
+        try:
+            import winreg
+            with winreg.OpenKey(winreg.HKEY_CURRENT_USER, r"Software\Valve\Steam") as key:
+                candidates.append(winreg.QueryValueEx(key, "SteamPath")[0])
+        except OSError:
+            pass
+        for var in ("ProgramFiles(x86)", "ProgramFiles"):
+            if os.environ.get(var):
+                candidates.append(os.path.join(os.environ[var], "Steam"))
+    elif sys.platform == "darwin":
+        candidates.append(os.path.expanduser("~/Library/Application Support/Steam"))
+    else:
+        candidates += [os.path.expanduser(p) for p in (
+            "~/.steam/steam", "~/.local/share/Steam",
+            "~/.var/app/com.valvesoftware.Steam/.local/share/Steam")]
+    for path in candidates:
+        if os.path.isdir(os.path.join(path, "steamapps")):
+            return os.path.normpath(path)
+    return None
+
+
+def library_folders(steam_root):
+    """steamapps directories of every library, the main install first"""
+    main = os.path.join(steam_root, "steamapps")
+    folders = [main]
+    seen = {os.path.normcase(os.path.normpath(main))}
+    vdf_path = os.path.join(main, "libraryfolders.vdf")
+    if not os.path.exists(vdf_path):
+        return folders
+    try:
+        libraries = read_vdf(vdf_path).get("libraryfolders") or {}
+    except VDFError as e:
+        raise VDFError(f"{vdf_path}: {e}") from e
+    for key, entry in libraries.items():
+        if not key.isdigit():
+            continue  # e.g. "contentstatsid", "timenextstatsreport"
+        # Current format: "0" { "path" "..." }; before mid-2021: "1" "D:\\Games"
+        path = entry.get("path") if isinstance(entry, dict) else entry
+        if not path:
+            continue
+        # Steam writes absolute paths; relative ones (fixtures) are taken from the Steam root
+        folder = os.path.normpath(os.path.join(steam_root, path, "steamapps"))
+        if os.path.normcase(folder) not in seen:
+            seen.add(os.path.normcase(folder))
+            folders.append(folder)
+    return folders
+
+
+def find_manifests(folders):
+    """Yield (path, appid, os.stat result) for every appmanifest_*.acf in the library folders"""
+    for folder in folders:
+        try:
+            entries = os.scandir(folder)
+        except OSError:
+            continue  # Library on a drive that isn't mounted right now
+        with entries:
+            for entry in entries:
+                match = MANIFEST_RE.match(entry.name)
+                if match and entry.is_file():
+                    yield entry.path, match.group(1), entry.stat()
+
+
+def read_manifest(path):
+    """{'appid', 'name', 'installdir'} from an appmanifest file"""
+    state = read_vdf(path).get("appstate") or {}
+    return {"appid": state.get("appid", ""), "name": state.get("name", ""),
+            "installdir": state.get("installdir", "")}
+
+
+def default_state_path():
+    return os.path.join(user_data_dir(), STATE_FILE)
+
+
+class LibraryScanner:
+    """Check every game installed through Steam, re-checking only manifests that changed.
+
+    The last scan is kept in a small JSON file: manifest path, mtime and
+    size, the page its AppID resolved to and the record written for it.
+    """
+
+    def __init__(self, lookup, steam_root=None, state_path=None, batch_size=BATCH_SIZE, concurrency=8):
+        self.lookup = lookup
+        steam_root = steam_root or default_steam_root()
+        self.steam_root = os.path.abspath(steam_root) if steam_root else None
+        self.state_path = state_path or default_state_path()
+        self.resolver = BulkResolver(lookup, batch_size=batch_size)
+        self.concurrency = concurrency
+
+    def load_state(self):
+        try:
+            with open(self.state_path, encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if state.get("version") != STATE_VERSION or state.get("steam_root") != self.steam_root:
+            return {}
+        return state.get("manifests", {})
+
+    def save_state(self, manifests):
+        tmp_path = self.state_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": STATE_VERSION, "steam_root": self.steam_root, "manifests": manifests}, f)
+        os.replace(tmp_path, self.state_path)
+
+    def scan(self, writer, full=False, stats=None, stopped=None):
+        """Write a record per installed game to writer; returns the BatchStats.
+
+        Unchanged manifests reuse their previous record. New or changed ones
+        are resolved by AppID in batches and checked concurrently. Once
+        stopped() returns true no further pages are checked; games left
+        unchecked are picked up by the next scan.
+        """
+        if not self.steam_root:
+            raise FileNotFoundError("Steam installation not found; pass its directory explicitly")
+        stats = stats or BatchStats()
+        previous = {} if full else self.load_state()
+        current = {}
+        changed = []
+        for path, appid, st in find_manifests(library_folders(self.steam_root)):
+            old = previous.get(path)
+            # Records from an offline scan only stand in until the wiki can be asked
+            if old and old["mtime_ns"] == st.st_mtime_ns and old["size"] == st.st_size \
+                    and not (old.get("offline") and not self.lookup.offline):
+                current[path] = old
+                writer.write(old["record"])
+                stats.add(old["record"])
+                continue
+            try:
+                manifest = read_manifest(path)
+            except (OSError, VDFError) as e:
+                print(f"Skipping {path}: {e}", file=sys.stderr)
+                continue
+            manifest["appid"] = manifest["appid"] or appid
+            current[path] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size,
+                             "appid": manifest["appid"], "name": manifest["name"] or manifest["installdir"]}
+            changed.append(path)
+
+        if changed:
+            self.check_changed([current[path] for path in changed], writer, stats, stopped or (lambda: False))
+        # Entries without a record failed to check; leave them out so the next scan retries
+        self.save_state({path: entry for path, entry in current.items() if "record" in entry})
+        return stats
+
+    def check_changed(self, entries, writer, stats, stopped):
+        """Resolve entries' AppIDs in batches, then check the pages concurrently.
+
+        Like run_batch, at most 2 * concurrency checks are queued at a time.
+        """
+        def check(entry, page):
+            # Queued checks are dropped once the scan is stopped
+            return None if stopped() else check_title(self.lookup, entry["name"], page)
+
+        def finish(entry, record):
+            record = dict(record, appid=entry["appid"])
+            if record["status"] != "error":
+                entry["record"] = record
+                entry["offline"] = self.lookup.offline
+            writer.write(record)
+            stats.add(record)
+
+        if stopped():
+            return
+        if self.lookup.offline:
+            pages = {}
+        else:
+            try:
+                pages = self.resolver.resolve_appids([entry["appid"] for entry in entries])
+            except Exception as e:
+                for entry in entries:
+                    finish(entry, {"input": entry["name"], "status": "error", "error": str(e)})
+                return
+        max_pending = self.concurrency * 2
+        pending = {}
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="drm-steam") as executor:
+            def drain():
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    record = future.result()
+                    if record is not None:
+                        finish(pending[future], record)
+                    del pending[future]
+
+            for entry in entries:
+                page = entry["page"] = pages.get(entry["appid"])
+                if page:
+                    if stopped():
+                        continue
+                    while len(pending) >= max_pending:
+                        drain()
+                    pending[executor.submit(check, entry, page)] = entry
+                elif self.lookup.offline and self.lookup.cache:
+                    # No network: anything cached under the installed name still counts
+                    finish(entry, make_record(entry["name"], self.lookup.cache.get(entry["name"], float("inf"))))
+                else:
+                    finish(entry, make_record(entry["name"], None))
+            while pending:
+                drain()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check DRM for every game in the local Steam library.")
+    parser.add_argument("--steam-dir", default=None, help="Steam install directory (default: auto-detect)")
+    parser.add_argument("--state", default=None, help=f"scan state file (default: {STATE_FILE} in the data dir)")
+    parser.add_argument("--full", action="store_true", help="re-check every game, not just changed manifests")
+    parser.add_argument("-o", "--output", default="-", help="output file (default: stdout)")
+    parser.add_argument("-f", "--format", choices=sorted(WRITERS), default="jsonl")
+    parser.add_argument("-j", "--concurrency", type=int, default=8, help="parallel page checks (default: 8)")
+    parser.add_argument("--offline", action="store_true", help="only use cached results, no network")
+    parser.add_argument("--api-url", default=API_URL, help="MediaWiki api.php endpoint")
+    args = parser.parse_args(argv)
+
+    lookup = DRMLookup(http=WikiClient(api_url=args.api_url, pool_size=args.concurrency), offline=args.offline)
+    scanner = LibraryScanner(lookup, steam_root=args.steam_dir, state_path=args.state,
+                             concurrency=max(1, args.concurrency))
+    out_stream = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+    try:
+        stats = scanner.scan(WRITERS[args.format](out_stream), full=args.full)
+    except (OSError, VDFError) as e:
+        print(e, file=sys.stderr)
+        return 2
+    finally:
+        if out_stream is not sys.stdout:
+            out_stream.close()
+    stats.report(final=True)
+    return 1 if stats.counts["error"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
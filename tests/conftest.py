@@ -0,0 +1,37 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.stub_server import StubWiki  # noqa: E402
+
+STEAM_ROOT = os.path.join(ROOT, "benchmarks", "fixtures", "steam", "Steam")
+
+
+class ListWriter:
+    """Batch writer that keeps the records"""
+
+    def __init__(self):
+        self.records = []
+
+    def write(self, record):
+        self.records.append(record)
+
+
+@pytest.fixture
+def stub():
+    """Local api.php serving the benchmark fixtures; .requests counts calls per action"""
+    server = StubWiki()
+    server.start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """Empty user data dir, so caches and state files never touch the real one"""
+    monkeypatch.setenv("STEAM_DRM_CHECKER_DATA", str(tmp_path))
+    return tmp_path
@@ -0,0 +1,77 @@
+import csv
+import json
+
+import pytest
+
+from conftest import ListWriter
+from drm_batch import CSV_FIELDS, main, run_batch
+from drm_http import WikiClient
+from drm_lookup import DRMLookup
+
+TITLES = ["Portal 2", "portl 2", "zzz qqq", "Hogwarts Legacy", "The Witcher 3: Wild Hunt"]
+
+
+def break_page(stub, page):
+    """Make the stub answer parse requests for page with HTTP 403, which is never retried"""
+    handle = stub.handle
+
+    def patched(params, gzip_ok):
+        if params.get("action") == "parse" and params.get("page") == page.replace(" ", "_"):
+            return 403, {}, b""
+        return handle(params, gzip_ok)
+    stub.handle = patched
+
+
+@pytest.fixture
+def lookup(stub, data_dir):
+    return DRMLookup(http=WikiClient(api_url=stub.url, retries=0))
+
+
+def test_run_batch_statuses_in_input_order(lookup, stub):
+    break_page(stub, "Hogwarts Legacy")
+    writer = ListWriter()
+    # One worker: records stream out in input order
+    stats = run_batch(lookup, iter(TITLES), writer, concurrency=1)
+    assert [r["input"] for r in writer.records] == TITLES
+    assert [r["status"] for r in writer.records] == ["found", "suggestions", "not_found", "error", "found"]
+    portal, suggestions, _, error, witcher = writer.records
+    assert portal["protection"] == "Steamworks DRM"
+    assert suggestions["suggestions"][0] == "Portal 2"
+    assert "HTTP 403" in error["error"]
+    assert witcher["game"] == "The Witcher 3: Wild Hunt"
+    assert stats.counts == {"found": 2, "suggestions": 1, "not_found": 1, "error": 1}
+
+
+def test_run_batch_concurrent_and_bulk(lookup):
+    for bulk_size in (0, 2):
+        writer = ListWriter()
+        run_batch(lookup, iter(TITLES * 3), writer, concurrency=4, bulk_size=bulk_size)
+        assert sorted(r["input"] for r in writer.records) == sorted(TITLES * 3)
+
+
+def run_main(stub, tmp_path, titles, *args):
+    titles_path = tmp_path / "titles.txt"
+    titles_path.write_text("# catalog\n" + "\n".join(titles) + "\n\n", encoding="utf-8")
+    out_path = tmp_path / "out"
+    code = main([str(titles_path), "-o", str(out_path), "--api-url", stub.url, "-j", "1", *args])
+    return code, out_path.read_text(encoding="utf-8")
+
+
+def test_main_csv(stub, data_dir, tmp_path):
+    code, output = run_main(stub, tmp_path, TITLES[:3], "-f", "csv")
+    assert code == 0
+    rows = list(csv.DictReader(output.splitlines()))
+    assert list(rows[0]) == CSV_FIELDS
+    assert [(r["input"], r["status"]) for r in rows] == [
+        ("Portal 2", "found"), ("portl 2", "suggestions"), ("zzz qqq", "not_found")]
+    assert rows[0]["protection"] == "Steamworks DRM"
+    assert rows[0]["stores"].startswith("Steam: ")
+    assert rows[1]["suggestions"].startswith("Portal 2; ")
+
+
+def test_main_exit_code_on_errors(stub, data_dir, tmp_path):
+    break_page(stub, "Hogwarts Legacy")
+    code, output = run_main(stub, tmp_path, ["Portal 2", "Hogwarts Legacy"], "--no-cache")
+    assert code == 1
+    records = [json.loads(line) for line in output.splitlines()]
+    assert [r["status"] for r in records] == ["found", "error"]
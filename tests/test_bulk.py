@@ -0,0 +1,38 @@
+from conftest import ListWriter
+from drm_batch import run_batch
+from drm_bulk import follow_redirects
+from drm_http import WikiClient
+from drm_lookup import DRMLookup
+
+TITLES = ["Portal 2", "The Witcher 3: Wild Hunt", "Grand Theft Auto V", "Hogwarts Legacy",
+          "Tiny Stub Game", "portal 2", "No Such Game"]
+
+
+def verdicts(stub, bulk_size):
+    lookup = DRMLookup(cache=None, http=WikiClient(api_url=stub.url, retries=0))
+    writer = ListWriter()
+    run_batch(lookup, TITLES, writer, concurrency=2, bulk_size=bulk_size)
+    return {r["input"]: (r["status"], r.get("game"), r.get("protection")) for r in writer.records}
+
+
+def test_follow_redirects_chains_and_normalization():
+    query = {"normalized": [{"from": "portal_2", "to": "Portal_2"}, {"from": "gta v", "to": "Gta v"}],
+             "redirects": [{"from": "Gta v", "to": "GTA V"}, {"from": "GTA V", "to": "Grand Theft Auto V"}]}
+    assert follow_redirects(query, ["portal_2", "gta v", "Hogwarts Legacy"]) == {
+        "portal_2": "Portal_2", "gta v": "Grand Theft Auto V", "Hogwarts Legacy": "Hogwarts Legacy"}
+
+
+def test_follow_redirects_stops_on_loops():
+    query = {"redirects": [{"from": "A", "to": "B"}, {"from": "B", "to": "A"}]}
+    assert follow_redirects(query, ["A"])["A"] in ("A", "B")
+
+
+def test_bulk_matches_per_title(stub):
+    per_title = verdicts(stub, 0)
+    parses = stub.requests["parse"]
+    bulk = verdicts(stub, 50)
+    assert bulk == per_title
+    assert per_title["The Witcher 3: Wild Hunt"][2] == "No protection"
+    assert per_title["Grand Theft Auto V"][2] == "Rockstar Games Launcher"
+    # Only Portal 2 has a single-valued Cargo DRM list, so only it skips the parse
+    assert stub.requests["parse"] - parses == parses - 1
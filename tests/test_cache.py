@@ -0,0 +1,95 @@
+import threading
+import time
+
+import pytest
+
+import drm_cache
+from drm_cache import Memo
+
+THREADS = 8
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def call_concurrently(memo, key, func):
+    """get_or_call(key, func) from THREADS threads released together; returns their results"""
+    barrier = threading.Barrier(THREADS)
+    results = [None] * THREADS
+
+    def run(i):
+        barrier.wait()
+        try:
+            results[i] = memo.get_or_call(key, func)
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    return results
+
+
+def test_concurrent_callers_share_one_call():
+    memo = Memo()
+    calls = []
+
+    def func():
+        calls.append(None)
+        # Hold the call open until every other caller is waiting on it
+        wait_for(lambda: memo.waits == THREADS - 1)
+        return "page"
+
+    assert call_concurrently(memo, "k", func) == ["page"] * THREADS
+    assert len(calls) == 1
+    assert (memo.misses, memo.waits) == (1, THREADS - 1)
+    assert memo.get_or_call("k", func) == "page" and memo.hits == 1
+
+
+def test_errors_reach_waiters_but_are_not_stored():
+    memo = Memo()
+
+    def func():
+        wait_for(lambda: memo.waits == THREADS - 1)
+        raise ValueError("boom")
+
+    results = call_concurrently(memo, "k", func)
+    assert all(isinstance(r, ValueError) and str(r) == "boom" for r in results)
+    # The next caller tries again instead of getting the old failure
+    assert memo.get_or_call("k", lambda: "page") == "page"
+    assert memo.misses == 2
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(drm_cache.time, "monotonic", lambda: now[0])
+    memo = Memo(ttl=60)
+    assert memo.get_or_call("k", lambda: 1) == 1
+    now[0] += 60
+    assert memo.get_or_call("k", lambda: 2) == 1
+    now[0] += 1
+    assert memo.get_or_call("k", lambda: 3) == 3
+    assert (memo.hits, memo.misses) == (1, 2)
+
+
+def test_least_recently_used_entry_is_evicted():
+    memo = Memo(maxsize=2)
+    memo.get_or_call("a", lambda: "a")
+    memo.get_or_call("b", lambda: "b")
+    memo.get_or_call("a", pytest.fail)  # Hit: "a" becomes the most recent
+    memo.get_or_call("c", lambda: "c")
+    assert memo.get_or_call("a", pytest.fail) == "a"
+    assert memo.get_or_call("b", lambda: "again") == "again"
+
+
+def test_clear():
+    memo = Memo()
+    memo.get_or_call("k", lambda: 1)
+    memo.clear()
+    assert memo.get_or_call("k", lambda: 2) == 2
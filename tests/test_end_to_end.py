@@ -0,0 +1,71 @@
+# Lookups, cache refreshes and a Steam scan against the local stub wiki
+import pytest
+
+from conftest import STEAM_ROOT, ListWriter
+from drm_http import WikiClient
+from drm_lookup import DRMLookup
+from drm_refresh import CacheRefresher
+from drm_steam import LibraryScanner
+
+
+@pytest.fixture
+def lookup(stub, data_dir):
+    return DRMLookup(http=WikiClient(api_url=stub.url, retries=0))
+
+
+def test_lookup_found(lookup, stub):
+    result = lookup.get_drm_info("portal 2")
+    assert result["game"] == "Portal 2"
+    assert result["protection"] == "Steamworks DRM"
+    assert [row["source"] for row in result["availability"]] == ["Steam"]
+    assert stub.requests["parse"] == 1
+
+
+def test_lookup_served_from_cache(lookup, stub):
+    first = lookup.get_drm_info("Portal 2")
+    requests = dict(stub.requests)
+    assert lookup.get_drm_info("Portal 2") == first
+    assert stub.requests == requests
+
+
+def test_lookup_suggestions(lookup):
+    result = lookup.get_drm_info("portl 2")
+    assert result["suggestions"][0] == "Portal 2"
+
+
+def test_lookup_missing(lookup, stub):
+    assert lookup.get_drm_info("zzz qqq") is None
+    assert "parse" not in stub.requests
+
+
+def test_refresh_fetches_only_edited_pages(lookup, stub):
+    lookup.get_drm_info("Portal 2")
+    lookup.get_drm_info("Hogwarts Legacy")
+    first = CacheRefresher(lookup).refresh()
+    assert first["mode"] == "revisions"
+    assert first["pages"] == 2 and first["refreshed"] == 0
+
+    stub.edit("Portal 2")
+    parses = stub.requests["parse"]
+    second = CacheRefresher(lookup).refresh()
+    assert second["mode"] == "recentchanges"
+    assert second["refreshed"] == 1 and second["failed"] == 0
+    assert stub.requests["parse"] == parses + 1
+    assert lookup.cache.info("Portal 2")[1] == stub.pages["Portal 2"]["parse"]["revid"]
+
+
+def test_refresh_full_check_after_edit(lookup, stub):
+    lookup.get_drm_info("Portal 2")
+    stub.edit("Portal 2")
+    summary = CacheRefresher(lookup).refresh(full_check=True)
+    assert summary["mode"] == "revisions"
+    assert summary["refreshed"] == 1
+
+
+def test_steam_scan(lookup, data_dir):
+    writer = ListWriter()
+    stats = LibraryScanner(lookup, steam_root=STEAM_ROOT).scan(writer)
+    statuses = {record["appid"]: record["status"] for record in writer.records}
+    assert statuses["620"] == "found"
+    assert "error" not in statuses.values()
+    assert stats.counts["error"] == 0
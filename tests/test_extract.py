@@ -0,0 +1,114 @@
+"""The single-pass extractor against the regexes the app originally used"""
+import re
+
+import pytest
+
+from benchmarks.stub_server import load_fixtures
+from drm_extract import build_result, parse_page
+
+
+def legacy_clean_html(html_text):
+    cleaned = re.sub(r'<[^>]*>', '', html_text)
+    return re.sub(r'\s+', ' ', cleaned).strip()
+
+
+def legacy_availability(html_content):
+    availability = []
+    table_match = re.search(r'<table[^>]*class="wikitable"[^>]*>(.*?)</table>', html_content,
+                            re.DOTALL | re.IGNORECASE)
+    if not table_match:
+        return availability
+    for row in re.findall(r'<tr[^>]*>(.*?)</tr>', table_match.group(1), re.DOTALL)[1:]:
+        cells = re.findall(r'<td[^>]*>(.*?)</td>', row, re.DOTALL)
+        if len(cells) >= 3:
+            os_info = []
+            if len(cells) > 5:
+                os_info = [name for name in ("Windows", "Mac", "Linux") if name in cells[5]]
+            availability.append({'source': legacy_clean_html(cells[0]), 'drm': legacy_clean_html(cells[1]),
+                                 'notes': legacy_clean_html(cells[2]), 'os': os_info})
+    return availability
+
+
+def legacy_drm(html_content):
+    drm_match = re.search(r'<tr[^>]*>\s*<th[^>]*>DRM\s*</th>\s*<td[^>]*>([^<]+)</td>', html_content, re.IGNORECASE)
+    if drm_match:
+        drm_text = drm_match.group(1).strip()
+        if "steam" in drm_text.lower():
+            return "Steamworks DRM"
+        elif "denuvo" in drm_text.lower():
+            return "Denuvo"
+        elif "none" in drm_text.lower() or "no drm" in drm_text.lower() or "drm-free" in drm_text.lower():
+            return "No protection"
+        return drm_text
+    for note in re.findall(r'<td[^>]*>([^<]*drm[^<]*)</td>', html_content, re.IGNORECASE):
+        if "drm-free" in note.lower() or "no drm" in note.lower():
+            return "No protection"
+        elif "steam drm" in note.lower():
+            return "Steamworks DRM"
+        elif "denuvo" in note.lower():
+            return "Denuvo"
+    if any(entry['source'].lower() == 'steam' for entry in legacy_availability(html_content)):
+        return "Steamworks DRM"
+    lowered = html_content.lower()
+    if "drm-free" in lowered:
+        return "No protection"
+    elif "steam drm" in lowered:
+        return "Steamworks DRM"
+    elif "denuvo" in lowered:
+        return "Denuvo"
+    elif "no drm" in lowered:
+        return "No protection"
+    return "Not specified"
+
+
+def legacy_result(html_content, game_name):
+    title_match = re.search(r'<h1[^>]*>([^<]+)</h1>', html_content)
+    availability = legacy_availability(html_content)
+    drm_result = legacy_drm(html_content)
+    if not drm_result:
+        if availability:
+            if any(entry['source'].lower() == 'steam' for entry in availability):
+                drm_result = "Steamworks DRM"
+        else:
+            drm_result = "Not specified"
+    summary_match = re.search(r'<p>([^<]*?)(?:<br|</p>)', html_content, re.IGNORECASE)
+    return {
+        'game': title_match.group(1).strip() if title_match else game_name,
+        'protection': drm_result,
+        'availability': availability,
+        'additional_info': summary_match.group(1).strip() if summary_match else None,
+    }
+
+
+PAGES, _ = load_fixtures()
+
+TABLE = ('<table class="wikitable"><tr><th>Source</th><th>DRM</th><th>Notes</th></tr>'
+         '<tr><td>GOG.com</td><td>DRM-free</td><td></td></tr></table>')
+
+EDGE_CASES = {
+    "steam_drm_free": "<h1>A</h1><p>Runs Steam DRM-free once installed.</p>",
+    "no_drm_free_then_denuvo": "<h1>B</h1><p>There is no drm-free build; the retail copy uses Denuvo.</p>",
+    "no_drm_only": "<h1>C</h1><p>Ships with No DRM at all.</p>",
+    "denuvo_in_note": "<h1>D</h1><table><tr><td>Denuvo DRM was removed later</td></tr></table>",
+    "blank_drm_cell": "<table><tr><th>DRM</th><td> </td></tr></table>" + TABLE,
+    "infobox_none": "<h1>E</h1><table><tr><th>DRM</th><td>None</td></tr></table><p>Summary<br/>more</p>",
+    "availability_only": TABLE,
+    "nothing": "<p>This page is a stub</p>",
+}
+
+
+@pytest.mark.parametrize("title", sorted(PAGES))
+def test_fixture_pages_match_legacy(title):
+    html = PAGES[title]["parse"]["text"]["*"]
+    assert build_result(parse_page(html), title) == legacy_result(html, title)
+
+
+@pytest.mark.parametrize("name", sorted(EDGE_CASES))
+def test_edge_cases_match_legacy(name):
+    html = EDGE_CASES[name]
+    assert build_result(parse_page(html), name) == legacy_result(html, name)
+
+
+def test_keywords_inside_longer_ones():
+    assert build_result(parse_page(EDGE_CASES["steam_drm_free"]), "A")["protection"] == "No protection"
+    assert build_result(parse_page(EDGE_CASES["no_drm_free_then_denuvo"]), "B")["protection"] == "No protection"
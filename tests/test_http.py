@@ -0,0 +1,58 @@
+import pytest
+import requests
+
+from drm_http import WikiClient, WikiError
+
+
+class FakeResponse:
+    status_code = 200
+    content = b'{"ok": 1}'
+    headers = {}
+
+    def json(self):
+        return {"ok": 1}
+
+
+class FakeSession:
+    """Raises the queued errors in turn, then answers"""
+
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def get(self, url, params=None, timeout=None):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return FakeResponse()
+
+
+def client_with(session, retries=2):
+    client = WikiClient(api_url="http://wiki.invalid/w/api.php", retries=retries, backoff=0)
+    client._session = session
+    return client
+
+
+@pytest.mark.parametrize("error", [requests.ConnectionError("reset"), requests.Timeout("slow"),
+                                   requests.exceptions.ChunkedEncodingError("cut off"),
+                                   requests.exceptions.ContentDecodingError("bad gzip")])
+def test_transient_errors_are_retried(error):
+    session = FakeSession(error)
+    client = client_with(session)
+    assert client.get_json({"action": "parse"}) == {"ok": 1}
+    assert session.calls == 2
+    assert client.retry_count == 1
+
+
+def test_persistent_transient_error_raises_wiki_error():
+    session = FakeSession(*[requests.exceptions.ChunkedEncodingError("cut off")] * 3)
+    with pytest.raises(WikiError):
+        client_with(session).get({"action": "parse"})
+    assert session.calls == 3
+
+
+def test_other_request_errors_raise_wiki_error_at_once():
+    session = FakeSession(requests.exceptions.InvalidURL("bad url"))
+    with pytest.raises(WikiError):
+        client_with(session).get({"action": "parse"})
+    assert session.calls == 1
@@ -0,0 +1,76 @@
+import random
+import time
+
+import pytest
+
+from drm_http import WikiClient
+from drm_index import TitleIndex
+
+TITLES = ["Portal", "Portal 2", "Portal Stories: Mel", "Bridge Constructor Portal", "Half-Life 2",
+          "The Witcher 3: Wild Hunt", "The Witcher 2: Assassins of Kings", "Grand Theft Auto V",
+          "Hogwarts Legacy", "S.T.A.L.K.E.R.: Shadow of Chernobyl"]
+WORDS = ["dark", "star", "legend", "war", "night", "city", "racer", "quest", "lost", "iron",
+         "shadow", "kingdom", "space", "tactics", "dungeon", "hero", "empire", "island", "zero", "storm"]
+
+
+@pytest.fixture(scope="module")
+def index():
+    return TitleIndex(TITLES)
+
+
+def test_complete_in_folded_order(index):
+    assert index.complete("portal") == ["Portal", "Portal 2", "Portal Stories: Mel"]
+    assert index.complete("the witcher") == ["The Witcher 2: Assassins of Kings", "The Witcher 3: Wild Hunt"]
+    assert index.complete("stalker") == []
+    assert index.complete("s.t.a.l") == ["S.T.A.L.K.E.R.: Shadow of Chernobyl"]
+    assert index.complete("portal", limit=2) == ["Portal", "Portal 2"]
+    assert index.complete("  ") == []
+
+
+def test_search_finds_typos(index):
+    assert index.search("witcher 3 wild hnut")[0] == "The Witcher 3: Wild Hunt"
+    assert index.search("hogwrats legacy")[0] == "Hogwarts Legacy"
+    assert index.search("grand theft auto 5")[0] == "Grand Theft Auto V"
+    assert index.search("qqqq") == []
+
+
+def test_suggest_puts_prefix_matches_first(index):
+    suggestions = index.suggest("portal 2", limit=4)
+    assert suggestions[0] == "Portal 2"
+    assert len(suggestions) == len(set(suggestions)) == 4
+
+
+def test_save_and_load_round_trip(data_dir, index):
+    index.built_at = 1700000000.0
+    index.save()
+    loaded = TitleIndex.load()
+    assert loaded.titles == index.titles
+    assert loaded.built_at == 1700000000.0
+    assert loaded.complete("portal") == index.complete("portal")
+
+
+def test_load_without_index(data_dir):
+    assert TitleIndex.load() is None
+
+
+def test_download(stub):
+    index = TitleIndex.download(WikiClient(api_url=stub.url, retries=0))
+    assert "Portal 2" in index.titles
+    assert index.built_at
+
+
+def test_queries_stay_fast_on_a_full_size_index():
+    rng = random.Random(1)
+    titles = [" ".join(rng.choice(WORDS).title() for _ in range(rng.randint(1, 4))) + f" {i}"
+              for i in range(60000)]
+    index = TitleIndex(titles)
+    for query in ("dark star", "legnd of the iron kngdom", "space"):
+        # Best of a few runs, so a busy machine doesn't fail the check
+        best = min(timed(index.suggest, query) for _ in range(5))
+        assert best < 0.010, f"{query!r} took {best * 1000:.1f} ms"
+
+
+def timed(func, *args):
+    started = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - started
@@ -0,0 +1,60 @@
+import pytest
+
+from benchmarks.stub_server import load_fixtures
+from drm_extract import build_result, parse_page
+from drm_model import OS, Protection, ResultTable, main
+
+
+@pytest.fixture(scope="module")
+def records():
+    pages, _ = load_fixtures()
+    found = [dict(build_result(parse_page(response["parse"]["text"]["*"]), title), input=title, status="found")
+             for title, response in sorted(pages.items())]
+    return found + [
+        {"input": "portl 2", "status": "suggestions", "suggestions": ["Portal 2", "Portal"]},
+        {"input": "Nothing", "status": "not_found"},
+        {"input": "Broken", "status": "error", "error": "HTTP 503"},
+        dict(found[0], input="Steam copy", appid="620"),
+    ]
+
+
+@pytest.mark.parametrize("name", ["results.drmc", "results.drmc.gz"])
+def test_round_trip_keeps_records_exactly(tmp_path, records, name):
+    table = ResultTable()
+    table.extend(records)
+    table.save(str(tmp_path / name))
+    assert list(ResultTable.load(str(tmp_path / name))) == records
+
+
+def test_results_are_typed(records):
+    table = ResultTable()
+    table.extend(records)
+    by_input = {record["input"]: i for i, record in enumerate(records)}
+
+    gta = table.result(by_input["Grand Theft Auto V"])
+    assert gta.protection is Protection.OTHER
+    assert gta.label == "Rockstar Games Launcher"
+    portal = table.result(by_input["Portal 2"])
+    assert portal.protection is Protection.STEAMWORKS
+    assert isinstance(portal.availability[0].os, OS)
+    assert table.result(by_input["Nothing"]) is None
+    # Store names are shared between records, not copied per row
+    steam_rows = [row for i in range(len(table)) if table.result(i)
+                  for row in table.result(i).availability if row.source == "Steam"]
+    assert len({id(row.source) for row in steam_rows}) == 1
+
+
+def test_other_format_versions_are_rejected(tmp_path):
+    path = tmp_path / "old.drmc"
+    path.write_bytes(b"DRMC\x01" + b"\x00" * 8)
+    with pytest.raises(ValueError, match="another version"):
+        ResultTable.load(str(path))
+
+
+def test_converts_between_formats(tmp_path, records):
+    table = ResultTable()
+    table.extend(records)
+    table.save(str(tmp_path / "a.drmc"))
+    assert main([str(tmp_path / "a.drmc"), str(tmp_path / "a.jsonl")]) == 0
+    assert main([str(tmp_path / "a.jsonl"), str(tmp_path / "b.drmc.gz")]) == 0
+    assert list(ResultTable.load(str(tmp_path / "b.drmc.gz"))) == records
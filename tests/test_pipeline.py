@@ -0,0 +1,42 @@
+import os
+import signal
+
+import pytest
+
+from drm_batch import check_title
+from drm_http import WikiClient
+from drm_lookup import DRMLookup
+from drm_pipeline import ExtractorError, ProcessExtractor
+
+TITLES = ["Portal 2", "The Witcher 3: Wild Hunt", "Grand Theft Auto V", "Hogwarts Legacy", "Tiny Stub Game"]
+
+
+@pytest.fixture(scope="module")
+def extractor():
+    with ProcessExtractor(2) as pool:
+        yield pool
+
+
+def lookup_for(stub, extractor=None):
+    return DRMLookup(cache=False, http=WikiClient(api_url=stub.url, retries=0), extractor=extractor)
+
+
+def test_pool_matches_in_thread_extraction(stub, extractor):
+    local, pooled = lookup_for(stub), lookup_for(stub, extractor)
+    for title in TITLES:
+        assert pooled.fetch_drm_info(title) == local.fetch_drm_info(title)
+    assert pooled.fetch_drm_info("No such page") is None
+
+
+def test_broken_pool_is_an_error_not_a_missing_page(stub):
+    broken = ProcessExtractor(1)
+    try:
+        lookup = lookup_for(stub, broken)
+        assert lookup.fetch_drm_info("Portal 2")["game"] == "Portal 2"
+        for pid in list(broken.pool._processes):
+            os.kill(pid, signal.SIGKILL)
+        with pytest.raises(ExtractorError):
+            lookup.fetch_drm_info("Portal 2")
+        assert check_title(lookup, "Portal 2")["status"] == "error"
+    finally:
+        broken.close()
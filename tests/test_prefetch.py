@@ -0,0 +1,115 @@
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from conftest import ROOT
+from drm_http import WikiClient
+from drm_lookup import DRMLookup
+from drm_prefetch import BackgroundExecutor, Prefetcher
+
+TITLES = ["Portal 2", "Hogwarts Legacy", "Tiny Stub Game"]
+
+
+@pytest.fixture
+def lookup(stub, data_dir):
+    return DRMLookup(http=WikiClient(api_url=stub.url, retries=0))
+
+
+def finish(prefetcher):
+    for future in prefetcher._futures:
+        if not future.cancelled():
+            future.result(timeout=5)
+
+
+def hold_worker(prefetcher):
+    """Keep the prefetcher's only worker busy until the returned event is set"""
+    started, release = threading.Event(), threading.Event()
+    prefetcher.executor.submit(lambda: started.set() or release.wait(5))
+    assert started.wait(5)
+    return release
+
+
+def test_runs_calls_and_reports_errors():
+    executor = BackgroundExecutor(2, thread_name_prefix="test")
+    assert executor.submit(lambda a, b: a + b, 2, 3).result(timeout=5) == 5
+    failing = executor.submit(lambda: 1 / 0)
+    assert isinstance(failing.exception(timeout=5), ZeroDivisionError)
+    executor.shutdown()
+
+
+def test_shutdown_cancels_queued_calls():
+    executor = BackgroundExecutor(1, thread_name_prefix="test")
+    started, release = threading.Event(), threading.Event()
+    running = executor.submit(lambda: started.set() or release.wait())
+    started.wait(5)
+    queued = executor.submit(lambda: "never")
+    executor.shutdown()
+    assert queued.cancelled()
+    release.set()
+    assert running.result(timeout=5) is True
+
+
+def test_exit_does_not_wait_for_running_calls():
+    code = ("import time; from drm_prefetch import BackgroundExecutor; "
+            "e = BackgroundExecutor(1, thread_name_prefix='t'); e.submit(time.sleep, 60); time.sleep(0.1); "
+            "e.shutdown()")
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True, timeout=30)
+    assert time.perf_counter() - start < 10
+
+
+def test_prefetched_entry_is_served_without_requests(lookup, stub):
+    prefetcher = Prefetcher(lookup)
+    prefetcher.prefetch(TITLES)
+    finish(prefetcher)
+    assert stub.requests["parse"] == 3
+    requests = dict(stub.requests)
+    assert lookup.get_drm_info("Hogwarts Legacy")["game"] == "Hogwarts Legacy"
+    assert stub.requests == requests
+    prefetcher.shutdown()
+
+
+def test_only_the_top_entries_are_prefetched(lookup, stub):
+    prefetcher = Prefetcher(lookup, max_items=1)
+    prefetcher.prefetch(TITLES)
+    finish(prefetcher)
+    assert stub.requests["parse"] == 1
+    prefetcher.shutdown()
+
+
+def test_cancel_drops_queued_titles(lookup, stub):
+    prefetcher = Prefetcher(lookup)
+    release = hold_worker(prefetcher)
+    prefetcher.prefetch(TITLES)
+    prefetcher.cancel()
+    release.set()
+    prefetcher.executor.submit(lambda: None).result(timeout=5)
+    assert "parse" not in stub.requests
+    prefetcher.shutdown()
+
+
+def test_new_list_replaces_pending_prefetches(lookup, stub):
+    prefetcher = Prefetcher(lookup)
+    release = hold_worker(prefetcher)
+    prefetcher.prefetch(TITLES[:2])
+    prefetcher.prefetch(TITLES[2:])
+    release.set()
+    finish(prefetcher)
+    assert stub.requests["parse"] == 1
+    assert lookup.cache.get("Tiny Stub Game") and not lookup.cache.get("Portal 2")
+    prefetcher.shutdown()
+
+
+def test_byte_budget_stops_further_fetches(lookup, stub):
+    prefetcher = Prefetcher(lookup, max_bytes=1)
+    prefetcher.prefetch(TITLES)
+    finish(prefetcher)
+    assert stub.requests["parse"] == 1
+    # A new list gets a fresh budget
+    prefetcher.prefetch(TITLES[1:])
+    finish(prefetcher)
+    assert stub.requests["parse"] == 2
+    prefetcher.shutdown()
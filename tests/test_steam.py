@@ -0,0 +1,111 @@
+# Steam library scans over the fixture install in benchmarks/fixtures/steam
+import os
+import shutil
+
+import pytest
+
+from conftest import STEAM_ROOT, ListWriter
+from drm_http import WikiClient
+from drm_lookup import DRMLookup
+from drm_steam import LibraryScanner, main
+
+EXPECTED = {
+    "620": ("found", "Portal 2", "Steamworks DRM"),
+    "292030": ("found", "The Witcher 3: Wild Hunt", "No protection"),
+    "990080": ("found", "Hogwarts Legacy", "Denuvo"),
+    "271590": ("found", "Grand Theft Auto V", "Rockstar Games Launcher"),
+    "228980": ("not_found", None, None),
+}
+
+
+@pytest.fixture
+def steam_root(tmp_path):
+    """Writable copy of the fixture install, so manifests can be touched"""
+    root = tmp_path / "steam"
+    shutil.copytree(os.path.dirname(STEAM_ROOT), str(root))
+    return str(root / "Steam")
+
+
+@pytest.fixture
+def scanner(stub, data_dir, steam_root):
+    lookup = DRMLookup(http=WikiClient(api_url=stub.url, retries=0))
+    return LibraryScanner(lookup, steam_root=steam_root)
+
+
+def scan(scanner, **kwargs):
+    writer = ListWriter()
+    stats = scanner.scan(writer, **kwargs)
+    return {r["appid"]: (r["status"], r.get("game"), r.get("protection")) for r in writer.records}, stats
+
+
+def test_scan_records(scanner, capsys):
+    records, stats = scan(scanner)
+    assert records == EXPECTED
+    assert stats.counts["error"] == 0
+    # The truncated manifest is reported and left out
+    assert "appmanifest_1091500.acf" in capsys.readouterr().err
+
+
+def test_unchanged_rescan_makes_no_requests(scanner, stub):
+    first, _ = scan(scanner)
+    requests = dict(stub.requests)
+    second, _ = scan(scanner)
+    assert second == first
+    assert stub.requests == requests
+
+
+def test_changed_manifest_is_rechecked(scanner, stub, steam_root):
+    scan(scanner)
+    manifest = os.path.join(steam_root, "steamapps", "appmanifest_620.acf")
+    with open(manifest, "a", encoding="utf-8") as f:
+        f.write("\n")
+    cargo = stub.requests["cargoquery"]
+    records, _ = scan(scanner)
+    assert records == EXPECTED
+    assert stub.requests["cargoquery"] == cargo + 1
+
+
+def test_stopped_scan_checks_nothing_and_resumes(scanner, stub):
+    records, _ = scan(scanner, stopped=lambda: True)
+    assert records == {}
+    assert not stub.requests
+    # Nothing was recorded as checked, so the next scan does them all
+    records, _ = scan(scanner)
+    assert records == EXPECTED
+
+
+def test_stop_during_checks(scanner, stub):
+    scanner.concurrency = 1
+    # Stop once the first page is downloaded; the check queued behind it is dropped
+    records, _ = scan(scanner, stopped=lambda: stub.requests.get("parse", 0) >= 1)
+    assert len(records) == 2 and records["228980"] == EXPECTED["228980"]
+    assert stub.requests["parse"] == 1
+    # Only the checked games were remembered
+    records, _ = scan(scanner)
+    assert records == EXPECTED
+    assert stub.requests["parse"] == 4
+
+
+def test_offline_scan_is_rechecked_online(scanner, stub):
+    scanner.lookup.offline = True
+    records, _ = scan(scanner)
+    assert {status for status, _, _ in records.values()} == {"not_found"}
+    assert not stub.requests
+    # Offline records are reused while offline...
+    assert scan(scanner)[0] == records
+    # ...but not once the wiki is reachable again
+    scanner.lookup.offline = False
+    records, _ = scan(scanner)
+    assert records == EXPECTED
+    assert stub.requests["parse"] == 4
+    requests = dict(stub.requests)
+    assert scan(scanner)[0] == EXPECTED
+    assert stub.requests == requests
+
+
+def test_main_reports_unreadable_library(steam_root, data_dir, capsys):
+    with open(os.path.join(steam_root, "steamapps", "libraryfolders.vdf"), "w", encoding="utf-8") as f:
+        f.write('"libraryfolders"\n{\n\t"0"\n\t{\n\t\t"path"\t\t"/broken\n')
+    assert main(["--steam-dir", steam_root, "--api-url", "http://127.0.0.1:9/api.php"]) == 2
+    err = capsys.readouterr().err
+    assert "libraryfolders.vdf" in err and "unterminated string" in err